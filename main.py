@@ -68,24 +68,28 @@ def main():
 
         elif choice == "2":
             print("\n--- Tarefas Pendentes ---")
-            pending_tasks = task_service.list_pending_tasks()
+            found = False
 
-            if not pending_tasks:
-                print("Nenhuma tarefa pendente no momento.")
-            else:
-                for task in pending_tasks:
+            for page in task_service.iter_task_snapshots(pending_only=True):
+                found = True
+                for task in page:
                     print(task)
 
+            if not found:
+                print("Nenhuma tarefa pendente no momento.")
+
         elif choice == "3":
             print("\n--- Todas as Tarefas (Pendentes e Concluídas) ---")
-            all_tasks = task_service.list_all_tasks()
+            found = False
 
-            if not all_tasks:
-                print("Nenhuma tarefa cadastrada no sistema.")
-            else:
-                for task in all_tasks:
+            for page in task_service.iter_task_snapshots():
+                found = True
+                for task in page:
                     print(task)
 
+            if not found:
+                print("Nenhuma tarefa cadastrada no sistema.")
+
         elif choice == "4":
             try:
                 task_id = int(
@@ -112,7 +116,7 @@ def main():
             print("\n--- Visualizar Tarefa Única ---")
             try:
                 task_id = int(input("Digite o ID da tarefa que deseja visualizar: "))
-                task = task_service.get_task_by_id(task_id)
+                task = task_service.get_task_by_id(task_id, include_archived=True)
 
                 if task:
                     print("Detalhes da Tarefa:")
@@ -1,77 +1,267 @@
-import json
+import argparse
 import os
 import sys
-from sqlalchemy import text
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 from src.utils.db_session import get_db_session, check_db_connection, init_db
 from src.model.task import Task
+from src.utils.json_stream import iter_json_records
+from src.service.batch_service import (
+    iter_chunks,
+    upsert_tasks_chunk,
+    delete_tasks_chunk,
+    copy_upsert_tasks_chunk,
+    partition_records,
+    merge_counters,
+    file_sha256,
+    load_checkpoint,
+    save_checkpoint,
+    clear_checkpoints,
+    checkpoint_worker_counts,
+    load_fk_ids,
+    load_existing_task_ids,
+    validate_records,
+    validate_delete_records,
+    write_dead_letters,
+)
 
 UPSERT_FILE = "data/upsert_data.json"
 DELETE_FILE = "data/delete_data.json"
+DEAD_LETTER_FILE = "data/upsert_dead_letter.jsonl"
+DELETE_DEAD_LETTER_FILE = "data/delete_dead_letter.jsonl"
+DEFAULT_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "1000"))
+DEFAULT_COPY_CHUNK_SIZE = int(os.getenv("BATCH_COPY_CHUNK_SIZE", "50000"))
 
 
-def load_json(file_path):
-    """Lê um arquivo JSON e retorna os dados."""
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"Erro: Arquivo {file_path} não encontrado.")
-        return []
-    except json.JSONDecodeError as e:
-        print(f"Erro ao decodificar JSON {file_path}: {e}")
-        return []
+def load_json_chunks(file_path, chunk_size, worker_index=0, workers=1, start=0):
+    """
+    Lê um arquivo JSON (array ou JSONL) em streaming e retorna um gerador de
+    blocos com até `chunk_size` pares (posição no arquivo, registro). Registros
+    antes da posição `start` são ignorados. Com mais de um worker, apenas os
+    registros da partição `worker_index` são retornados.
+    """
+    records = islice(enumerate(iter_json_records(file_path)), start, None)
+    if workers > 1:
+        records = partition_records(records, worker_index, workers)
+    return iter_chunks(records, chunk_size)
 
 
-def run_upsert():
+def job_prefix(phase, file_path):
+    """Prefixo comum aos checkpoints de todas as partições de uma carga."""
+    return f"{phase}:{os.path.abspath(file_path)}:"
+
+
+def load_resume_position(db, key, file_hash, resume, label):
     """
-    Item 3 e 4: Realiza INSERT ou UPDATE (Upsert) massivo.
+    Retorna a posição do arquivo a partir da qual a partição deve continuar,
+    ou None se ela já foi concluída em uma execução anterior.
     """
-    print(f"\n>>> Iniciando Processo de UPSERT (Carga Massiva) usando {UPSERT_FILE}")
+    checkpoint = load_checkpoint(db, key, file_hash) if resume else None
+    if checkpoint is None:
+        return 0
+    if checkpoint.completed:
+        print(f"   {label}[RESUME] Partição já concluída em execução anterior.")
+        return None
+    print(
+        f"   {label}[RESUME] Retomando a partir do registro {checkpoint.record_index}."
+    )
+    return checkpoint.record_index
+
+
+def prepare_checkpoints(phase, file_path, file_hash, workers, resume):
+    """
+    Confere os checkpoints da carga antes de começar. Sem `resume`, os
+    checkpoints anteriores são descartados. Com `resume`, a carga é recusada
+    se houver uma execução interrompida com outra quantidade de workers: as
+    partições seriam diferentes, nenhum checkpoint seria encontrado e os
+    registros sem ID de blocos já confirmados seriam inseridos de novo.
+
+    Returns:
+        bool: True se a carga pode prosseguir.
+    """
+    prefix = job_prefix(phase, file_path)
+    db = get_db_session()
+    try:
+        if not resume:
+            clear_checkpoints(db, prefix)
+            db.commit()
+            return True
+
+        other_counts = checkpoint_worker_counts(db, prefix, file_hash) - {workers}
+        if other_counts:
+            counts = ", ".join(str(count) for count in sorted(other_counts))
+            print(
+                f"Erro: há uma execução interrompida de {file_path} com --workers {counts}. "
+                "Execute novamente com o mesmo --workers para retomar, ou use "
+                "--no-resume para processar o arquivo do início."
+            )
+            return False
+        return True
+    finally:
+        db.close()
 
-    data = load_json(UPSERT_FILE)
-    if not data:
-        return
+
+def run_partitioned(function, args, workers):
+    """
+    Executa `function(*args)` no processo atual (workers=1) ou em um processo
+    por partição, cada um com sua própria engine e conexão, somando os
+    contadores retornados por cada worker.
+    """
+    if workers == 1:
+        return function(*args)
+
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=get_context("spawn")
+    ) as pool:
+        futures = [
+            pool.submit(function, *args, worker_index, workers)
+            for worker_index in range(workers)
+        ]
+        return merge_counters([future.result() for future in futures])
+
+
+def dead_letter_path(base_path, worker_index=0, workers=1):
+    """Arquivo de dead-letter da partição (um arquivo por worker)."""
+    if workers == 1:
+        return base_path
+    root, extension = os.path.splitext(base_path)
+    return f"{root}.w{worker_index}{extension}"
+
+
+def process_upsert(
+    file_path,
+    file_hash,
+    chunk_size,
+    mode,
+    resume,
+    dead_letter_file=DEAD_LETTER_FILE,
+    worker_index=0,
+    workers=1,
+):
+    """
+    Executa o Upsert de uma partição do arquivo e retorna os contadores
+    {"inserted", "updated", "rejected", "chunks"}. Cada bloco é confirmado
+    junto com o seu checkpoint; em caso de falha, apenas o bloco atual é
+    desfeito. Registros com FK inexistente ou sem campos obrigatórios são
+    desviados para o arquivo de dead-letter em vez de abortar a carga.
+    """
+    label = f"[W{worker_index}] " if workers > 1 else ""
+    dead_letter_file = dead_letter_path(dead_letter_file, worker_index, workers)
+    key = f"{job_prefix('upsert', file_path)}{worker_index}/{workers}"
 
     db = get_db_session()
     try:
         count_insert = 0
         count_update = 0
+        count_rejected = 0
+        count_chunks = 0
 
-        for item in data:
-            task_id = item.get("id_task")
+        position = load_resume_position(db, key, file_hash, resume, label)
+        if position is None:
+            return {"inserted": 0, "updated": 0, "rejected": 0, "chunks": 0}
 
-            existing_task = None
-            if task_id:
-                existing_task = db.query(Task).filter(Task.id_task == task_id).first()
+        # Uma execução do início descarta o dead-letter anterior; uma
+        # retomada continua acrescentando ao mesmo arquivo.
+        write_dead_letters(dead_letter_file, [], truncate=position == 0)
+        user_ids, category_ids = load_fk_ids(db)
 
-            if existing_task:
-                print(f"   [UPDATE] Atualizando tarefa ID {task_id}...")
-                existing_task.description = item.get(
-                    "description", existing_task.description
-                )
-                existing_task.status = item.get("status", existing_task.status)
-                existing_task.user_id_fk = item.get(
-                    "user_id_fk", existing_task.user_id_fk
-                )
-                existing_task.category_id_fk = item.get(
-                    "category_id_fk", existing_task.category_id_fk
-                )
-                count_update += 1
-            else:
-                print(f"   [INSERT] Criando nova tarefa: {item.get('description')}")
-                new_task = Task(
-                    description=item.get("description"),
-                    status=item.get("status", "Pendente"),
-                    user_id_fk=item.get("user_id_fk"),
-                    category_id_fk=item.get("category_id_fk"),
+        chunks = load_json_chunks(
+            file_path, chunk_size, worker_index, workers, position
+        )
+        for chunk in chunks:
+            existing_ids = load_existing_task_ids(db, chunk)
+            items, rejected = validate_records(
+                chunk, user_ids, category_ids, existing_ids
+            )
+            inserted, updated = 0, 0
+            if items and mode == "copy":
+                inserted, updated = copy_upsert_tasks_chunk(db, items)
+            elif items:
+                inserted, updated = upsert_tasks_chunk(db, items)
+
+            position = chunk[-1][0] + 1
+            save_checkpoint(db, key, file_path, file_hash, position)
+            db.commit()
+            write_dead_letters(dead_letter_file, rejected)
+
+            print(
+                f"   {label}[CHUNK] {len(chunk)} registros: {inserted} inseridos, {updated} atualizados."
+            )
+            for entry in rejected:
+                print(
+                    f"   {label}[REJEITADO] Registro {entry['position']}: {entry['reason']}."
                 )
-                db.add(new_task)
-                count_insert += 1
+            count_insert += inserted
+            count_update += updated
+            count_rejected += len(rejected)
+            count_chunks += 1
+
+        save_checkpoint(db, key, file_path, file_hash, position, completed=True)
+        db.commit()
+        return {
+            "inserted": count_insert,
+            "updated": count_update,
+            "rejected": count_rejected,
+            "chunks": count_chunks,
+        }
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def run_upsert(chunk_size=DEFAULT_CHUNK_SIZE, mode="upsert", workers=1, resume=True):
+    """
+    Item 3 e 4: Realiza INSERT ou UPDATE (Upsert) massivo.
+    Os registros são enviados em blocos de `chunk_size`. No modo "upsert" cada
+    bloco é um UPDATE ... FROM (VALUES ...) dos registros com ID e um INSERT
+    de múltiplas linhas dos novos; no modo "copy"
+    o bloco é enviado via COPY para uma tabela de staging e mesclado em `task`.
+    Com `workers` > 1, cada partição de IDs é processada em um processo próprio.
+    Cada bloco é confirmado com um checkpoint; com `resume`, uma execução
+    interrompida continua após o último bloco confirmado.
+    """
+    print(f"\n>>> Iniciando Processo de UPSERT (Carga Massiva) usando {UPSERT_FILE}")
+    if mode == "copy":
+        print("   Modo COPY: registros enviados via staging temporária.")
+    if workers > 1:
+        print(f"   Processando em {workers} workers particionados por id_task.")
+
+    if not os.path.exists(UPSERT_FILE):
+        print(f"Erro: Arquivo {UPSERT_FILE} não encontrado.")
+        return
+
+    file_hash = file_sha256(UPSERT_FILE)
+    if not prepare_checkpoints("upsert", UPSERT_FILE, file_hash, workers, resume):
+        return
+
+    try:
+        stats = run_partitioned(
+            process_upsert,
+            (UPSERT_FILE, file_hash, chunk_size, mode, resume, DEAD_LETTER_FILE),
+            workers,
+        )
+    except Exception as e:
+        print(f"Erro durante o Upsert: {e}")
+        print(
+            "Os blocos já confirmados foram mantidos; execute novamente para retomar."
+        )
+        return
 
+    db = get_db_session()
+    try:
+        clear_checkpoints(db, job_prefix("upsert", UPSERT_FILE))
         db.commit()
         print(
-            f"Sucesso! {count_update} tarefas atualizadas e {count_insert} tarefas inseridas."
+            f"Sucesso! {stats['updated']} tarefas atualizadas e {stats['inserted']} tarefas inseridas."
         )
+        if stats["rejected"]:
+            print(
+                f"Atenção: {stats['rejected']} registros rejeitados foram gravados em "
+                f"{dead_letter_path(DEAD_LETTER_FILE, '*', workers)}."
+            )
 
         verify_upsert(db)
 
@@ -90,70 +280,225 @@ def verify_upsert(db):
         print(t)
 
 
-def run_delete():
+def process_delete(
+    file_path,
+    file_hash,
+    chunk_size,
+    resume,
+    dead_letter_file=DELETE_DEAD_LETTER_FILE,
+    worker_index=0,
+    workers=1,
+):
     """
-    Item 5 e 6: Realiza Deleção massiva.
+    Executa a deleção de uma partição do arquivo e retorna os contadores
+    {"requested", "deleted", "skipped_ids", "rejected", "chunks"}. Cada bloco
+    é confirmado junto com o seu checkpoint; em caso de falha, apenas o bloco
+    atual é desfeito. Registros sem um `id_task` inteiro são desviados para o
+    arquivo de dead-letter em vez de abortar a deleção.
     """
-    print(f"\n>>> Iniciando Processo de DELEÇÃO Massiva usando {DELETE_FILE}")
-
-    data = load_json(DELETE_FILE)
-    if not data:
-        return
+    label = f"[W{worker_index}] " if workers > 1 else ""
+    dead_letter_file = dead_letter_path(dead_letter_file, worker_index, workers)
+    key = f"{job_prefix('delete', file_path)}{worker_index}/{workers}"
 
     db = get_db_session()
     try:
+        count_requested = 0
         count_deleted = 0
+        count_rejected = 0
+        count_chunks = 0
+        skipped_ids = []
+
+        position = load_resume_position(db, key, file_hash, resume, label)
+        if position is None:
+            return {
+                "requested": 0,
+                "deleted": 0,
+                "skipped_ids": [],
+                "rejected": 0,
+                "chunks": 0,
+            }
+
+        write_dead_letters(dead_letter_file, [], truncate=position == 0)
+        chunks = load_json_chunks(
+            file_path, chunk_size, worker_index, workers, position
+        )
+        for chunk in chunks:
+            task_ids, rejected = validate_delete_records(chunk)
+            deleted_ids = set(delete_tasks_chunk(db, task_ids)) if task_ids else set()
+
+            position = chunk[-1][0] + 1
+            save_checkpoint(db, key, file_path, file_hash, position)
+            db.commit()
+            write_dead_letters(dead_letter_file, rejected)
+
+            print(
+                f"   {label}[DELETE] {len(deleted_ids)} tarefas removidas neste bloco."
+            )
+            for task_id in task_ids:
+                if task_id not in deleted_ids:
+                    print(
+                        f"   {label}[SKIP] Tarefa ID {task_id} não encontrada para deleção."
+                    )
+                    skipped_ids.append(task_id)
+            for entry in rejected:
+                print(
+                    f"   {label}[REJEITADO] Registro {entry['position']}: {entry['reason']}."
+                )
+
+            count_requested += len(task_ids)
+            count_deleted += len(deleted_ids)
+            count_rejected += len(rejected)
+            count_chunks += 1
 
-        for item in data:
-            task_id = item.get("id_task")
-            if not task_id:
-                continue
+        save_checkpoint(db, key, file_path, file_hash, position, completed=True)
+        db.commit()
+        return {
+            "requested": count_requested,
+            "deleted": count_deleted,
+            "skipped_ids": skipped_ids,
+            "rejected": count_rejected,
+            "chunks": count_chunks,
+        }
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
-            task_to_delete = db.query(Task).filter(Task.id_task == task_id).first()
 
-            if task_to_delete:
-                db.delete(task_to_delete)
-                print(f"   [DELETE] Tarefa ID {task_id} removida.")
-                count_deleted += 1
-            else:
-                print(f"   [SKIP] Tarefa ID {task_id} não encontrada para deleção.")
+def run_delete(chunk_size=DEFAULT_CHUNK_SIZE, workers=1, resume=True):
+    """
+    Item 5 e 6: Realiza Deleção massiva.
+    Cada bloco é removido com um único DELETE ... WHERE id_task = ANY(:ids)
+    RETURNING id_task; os IDs retornados definem o que foi removido ou ignorado.
+    """
+    print(f"\n>>> Iniciando Processo de DELEÇÃO Massiva usando {DELETE_FILE}")
 
-        db.commit()
-        print(f"Sucesso! {count_deleted} tarefas removidas.")
+    if not os.path.exists(DELETE_FILE):
+        print(f"Erro: Arquivo {DELETE_FILE} não encontrado.")
+        return
 
-        verify_delete(db, data)
+    file_hash = file_sha256(DELETE_FILE)
+    if not prepare_checkpoints("delete", DELETE_FILE, file_hash, workers, resume):
+        return
 
+    try:
+        stats = run_partitioned(
+            process_delete,
+            (DELETE_FILE, file_hash, chunk_size, resume, DELETE_DEAD_LETTER_FILE),
+            workers,
+        )
     except Exception as e:
-        db.rollback()
         print(f"Erro durante a Deleção: {e}")
+        print(
+            "Os blocos já confirmados foram mantidos; execute novamente para retomar."
+        )
+        return
+
+    db = get_db_session()
+    try:
+        clear_checkpoints(db, job_prefix("delete", DELETE_FILE))
+        db.commit()
     finally:
         db.close()
 
+    print(f"Sucesso! {stats.get('deleted', 0)} tarefas removidas.")
+    if stats.get("rejected"):
+        print(
+            f"Atenção: {stats['rejected']} registros rejeitados foram gravados em "
+            f"{dead_letter_path(DELETE_DEAD_LETTER_FILE, '*', workers)}."
+        )
 
-def verify_delete(db, data_attempted):
-    """Confere se os IDs realmente sumiram."""
-    print("\n--- Verificação pós-Deleção ---")
-    ids_to_check = [item["id_task"] for item in data_attempted if "id_task" in item]
+    verify_delete(
+        stats.get("requested", 0),
+        stats.get("deleted", 0),
+        stats.get("skipped_ids", []),
+    )
 
-    remaining = db.query(Task).filter(Task.id_task.in_(ids_to_check)).all()
 
-    if not remaining:
-        print("Confirmação: Nenhum dos IDs deletados foi encontrado no banco.")
+def verify_delete(count_requested, count_deleted, skipped_ids):
+    """
+    Confere o resultado da deleção a partir dos IDs retornados pelo
+    DELETE ... RETURNING, sem consultar o banco novamente: todo ID solicitado
+    deve ter sido removido ou constar como inexistente.
+    """
+    print("\n--- Verificação pós-Deleção ---")
+    print(
+        f"Confirmação: {count_deleted} tarefas removidas confirmadas pelo banco (RETURNING)."
+    )
+    if skipped_ids:
+        print(f"IDs que não constavam no banco: {skipped_ids}")
+
+    unaccounted = count_requested - count_deleted - len(skipped_ids)
+    if unaccounted == 0:
+        print(
+            f"Todos os {count_requested} IDs solicitados foram removidos ou já não existiam."
+        )
     else:
         print(
-            f"Atenção: As seguintes tarefas ainda constam no banco: {[t.id_task for t in remaining]}"
+            f"Atenção: {unaccounted} dos {count_requested} IDs solicitados não foram "
+            "confirmados pelo RETURNING."
         )
 
 
+def parse_args():
+    """Lê as opções de linha de comando da carga em lote."""
+    parser = argparse.ArgumentParser(description="Carga e deleção massiva (TP4).")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help=(
+            "Registros por comando enviado ao banco (padrão: BATCH_CHUNK_SIZE ou 1000; "
+            "no modo copy, BATCH_COPY_CHUNK_SIZE ou 50000)."
+        ),
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["upsert", "copy"],
+        default="upsert",
+        help="Estratégia de carga: UPDATE/INSERT set-based (upsert) ou COPY + merge (copy).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processos paralelos, cada um com uma partição de id_task (padrão: 1).",
+    )
+    parser.add_argument(
+        "--no-resume",
+        dest="resume",
+        action="store_false",
+        help="Ignora checkpoints de execuções interrompidas e processa os arquivos do início.",
+    )
+    args = parser.parse_args()
+    if args.chunk_size is None:
+        args.chunk_size = (
+            DEFAULT_COPY_CHUNK_SIZE if args.mode == "copy" else DEFAULT_CHUNK_SIZE
+        )
+    if args.chunk_size < 1:
+        parser.error("--chunk-size deve ser maior que zero.")
+    if args.workers < 1:
+        parser.error("--workers deve ser maior que zero.")
+    return args
+
+
 def main():
+    args = parse_args()
+
     if not check_db_connection():
         sys.exit(1)
 
     init_db()
 
-    run_upsert()
+    run_upsert(
+        chunk_size=args.chunk_size,
+        mode=args.mode,
+        workers=args.workers,
+        resume=args.resume,
+    )
 
-    run_delete()
+    run_delete(chunk_size=args.chunk_size, workers=args.workers, resume=args.resume)
 
 
 if __name__ == "__main__":
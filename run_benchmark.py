@@ -0,0 +1,477 @@
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from sqlalchemy import event, text
+from src.utils.db_session import engine, get_db_session, check_db_connection, init_db
+from sqlalchemy.dialects.postgresql import insert
+from src.model.task import Task
+from src.utils.json_stream import iter_json_records
+from src.service.batch_service import (
+    iter_chunks,
+    file_sha256,
+    clear_checkpoints,
+    sync_task_id_sequence,
+)
+import run_batch
+
+DEFAULT_STRATEGIES = ["upsert", "copy", "upsert:4", "copy:4"]
+STATUSES = ["Pendente", "Concluída"]
+
+_statement_count = 0
+_listener_installed = False
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    """Listener do SQLAlchemy que conta os comandos enviados ao banco."""
+    global _statement_count
+    _statement_count += 1
+
+
+def _install_statement_counter():
+    """Registra (uma vez por processo) o contador de comandos na engine."""
+    global _listener_installed
+    if not _listener_installed:
+        event.listen(engine, "before_cursor_execute", _count_statement)
+        _listener_installed = True
+
+
+def _counted(function, *args):
+    """
+    Executa uma função de carga do run_batch e acrescenta ao resultado a
+    quantidade de comandos SQL executados pelo processo.
+    """
+    global _statement_count
+    _install_statement_counter()
+    _statement_count = 0
+    result = function(*args)
+    result["statements"] = _statement_count
+    return result
+
+
+def counted_process_upsert(*args):
+    """Versão de `run_batch.process_upsert` que também conta os comandos."""
+    return _counted(run_batch.process_upsert, *args)
+
+
+def counted_process_delete(*args):
+    """Versão de `run_batch.process_delete` que também conta os comandos."""
+    return _counted(run_batch.process_delete, *args)
+
+
+def _weighted_picker(ids, distribution, rng):
+    """
+    Retorna uma função que sorteia um ID de FK segundo a distribuição
+    escolhida: "uniform" (todos iguais) ou "zipf" (poucos IDs concentram a
+    maior parte das tarefas).
+    """
+    if distribution == "zipf":
+        weights = [1 / rank for rank in range(1, len(ids) + 1)]
+        return lambda: rng.choices(ids, weights=weights)[0]
+    return lambda: rng.choice(ids)
+
+
+def _write_records(file_path, records, file_format):
+    """Grava os registros em streaming como array JSON ou JSONL."""
+    with open(file_path, "w", encoding="utf-8") as f:
+        if file_format == "jsonl":
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return
+
+        f.write("[\n")
+        for index, record in enumerate(records):
+            if index:
+                f.write(",\n")
+            f.write(json.dumps(record, ensure_ascii=False))
+        f.write("\n]\n")
+
+
+def generate_dataset(
+    output_dir,
+    rows,
+    mix,
+    user_ids,
+    category_ids,
+    distribution="uniform",
+    file_format="json",
+    first_id=1,
+    token="bench",
+    seed=42,
+):
+    """
+    Gera arquivos sintéticos no formato de `upsert_data.json` e
+    `delete_data.json`.
+
+    Os `rows` registros são divididos segundo `mix` (inserção, atualização,
+    deleção). Atualizações e deleções referem-se a tarefas com IDs a partir
+    de `first_id`, que precisam existir antes da carga; por isso também é
+    gerado um arquivo de semente com essas tarefas.
+
+    Args:
+        output_dir (str): Diretório onde os arquivos serão criados.
+        rows (int): Quantidade total de operações.
+        mix (tuple[float, float, float]): Proporção de inserções, atualizações e deleções.
+        user_ids (list[int]): IDs de usuários válidos para `user_id_fk`.
+        category_ids (list[int]): IDs de categorias válidas para `category_id_fk`.
+        distribution (str): Distribuição das FKs ("uniform" ou "zipf").
+        file_format (str): "json" (array) ou "jsonl".
+        first_id (int): Primeiro ID usado pelas tarefas de semente.
+        token (str): Prefixo das descrições, usado para limpar os dados depois.
+        seed (int): Semente do gerador aleatório.
+
+    Returns:
+        dict: Caminhos ("seed", "upsert", "delete", "dead_letter",
+        "delete_dead_letter") e contagens de cada operação.
+    """
+    rng = random.Random(seed)
+    pick_user = _weighted_picker(user_ids, distribution, rng)
+    pick_category = _weighted_picker(category_ids, distribution, rng)
+
+    total = sum(mix)
+    count_update = int(rows * mix[1] / total)
+    count_delete = int(rows * mix[2] / total)
+    count_insert = rows - count_update - count_delete
+
+    def task(index, task_id=None):
+        record = {
+            "description": f"{token} tarefa sintética {index}",
+            "status": rng.choice(STATUSES),
+            "user_id_fk": pick_user(),
+            "category_id_fk": pick_category(),
+        }
+        if task_id is not None:
+            record = {"id_task": task_id, **record}
+        return record
+
+    update_ids = range(first_id, first_id + count_update)
+    delete_ids = range(first_id + count_update, first_id + count_update + count_delete)
+
+    def upsert_records():
+        # Distribui as atualizações uniformemente entre as inserções.
+        pending_updates = iter(update_ids)
+        total_upserts = count_insert + count_update
+        for index in range(total_upserts):
+            is_update = (index + 1) * count_update // total_upserts > (
+                index * count_update // total_upserts
+            )
+            yield task(index, next(pending_updates) if is_update else None)
+
+    files = {
+        "seed": os.path.join(output_dir, f"seed.{file_format}"),
+        "upsert": os.path.join(output_dir, f"upsert.{file_format}"),
+        "delete": os.path.join(output_dir, f"delete.{file_format}"),
+        "dead_letter": os.path.join(output_dir, "dead_letter.jsonl"),
+        "delete_dead_letter": os.path.join(output_dir, "delete_dead_letter.jsonl"),
+    }
+    _write_records(
+        files["seed"],
+        (
+            task(index, task_id)
+            for index, task_id in enumerate([*update_ids, *delete_ids])
+        ),
+        file_format,
+    )
+    _write_records(files["upsert"], upsert_records(), file_format)
+    _write_records(
+        files["delete"], ({"id_task": task_id} for task_id in delete_ids), file_format
+    )
+
+    return {
+        **files,
+        "inserts": count_insert,
+        "updates": count_update,
+        "deletes": count_delete,
+    }
+
+
+def _peak_rss_mb():
+    """
+    Pico de memória residente (MB) do processo atual ou do maior de seus
+    processos filhos já finalizados (ru_maxrss é reportado em KB no Linux).
+    """
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return round(peak / 1024, 1)
+
+
+def run_strategy(dataset, mode, workers, chunk_size):
+    """
+    Executa a carga medida (Upsert seguido de deleção) com uma estratégia.
+    Roda em um processo isolado, para que o pico de memória seja só dela.
+
+    Returns:
+        dict: Métricas da execução (tempo, linhas/s, memória e comandos).
+    """
+    started = time.perf_counter()
+
+    upsert_stats = run_batch.run_partitioned(
+        counted_process_upsert,
+        (
+            dataset["upsert"],
+            file_sha256(dataset["upsert"]),
+            chunk_size,
+            mode,
+            False,
+            dataset["dead_letter"],
+        ),
+        workers,
+    )
+    delete_stats = run_batch.run_partitioned(
+        counted_process_delete,
+        (
+            dataset["delete"],
+            file_sha256(dataset["delete"]),
+            chunk_size,
+            False,
+            dataset["delete_dead_letter"],
+        ),
+        workers,
+    )
+
+    elapsed = time.perf_counter() - started
+    records = dataset["inserts"] + dataset["updates"] + dataset["deletes"]
+
+    # COPY é enviado direto pelo cursor do psycopg2 (um por bloco), fora dos
+    # eventos do SQLAlchemy.
+    statements = upsert_stats.get("statements", 0) + delete_stats.get("statements", 0)
+    if mode == "copy":
+        statements += upsert_stats.get("chunks", 0)
+
+    return {
+        "records": records,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(records / elapsed, 1) if elapsed else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "statements": statements,
+        "inserted": upsert_stats.get("inserted", 0),
+        "updated": upsert_stats.get("updated", 0),
+        "deleted": delete_stats.get("deleted", 0),
+        "rejected": upsert_stats.get("rejected", 0),
+    }
+
+
+def _seed_dataset(dataset):
+    """
+    Insere (fora da medição) as tarefas que serão atualizadas e deletadas,
+    com os IDs explícitos do arquivo de semente. O run_batch não serve aqui,
+    porque trata IDs inexistentes como tarefas novas.
+    """
+    db = get_db_session()
+    try:
+        records = iter_json_records(dataset["seed"])
+        for chunk in iter_chunks(records, run_batch.DEFAULT_CHUNK_SIZE):
+            db.execute(insert(Task.__table__).values(chunk))
+        sync_task_id_sequence(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _cleanup_dataset(dataset, token):
+    """Remove as tarefas sintéticas e os checkpoints criados pelo benchmark."""
+    db = get_db_session()
+    try:
+        db.execute(
+            text("DELETE FROM task WHERE description LIKE :pattern"),
+            {"pattern": f"{token} %"},
+        )
+        for phase, key in (
+            ("upsert", "seed"),
+            ("upsert", "upsert"),
+            ("delete", "delete"),
+        ):
+            clear_checkpoints(db, run_batch.job_prefix(phase, dataset[key]))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _load_fk_ids():
+    """Busca os IDs de usuários e categorias existentes para gerar FKs válidas."""
+    db = get_db_session()
+    try:
+        user_ids = list(
+            db.execute(text('SELECT id_user FROM "user" ORDER BY 1')).scalars()
+        )
+        category_ids = list(
+            db.execute(text("SELECT id_category FROM category ORDER BY 1")).scalars()
+        )
+        next_id = db.execute(
+            text("SELECT COALESCE(MAX(id_task), 0) + 1 FROM task")
+        ).scalar()
+        return user_ids, category_ids, next_id
+    finally:
+        db.close()
+
+
+def parse_strategy(spec):
+    """Converte "modo[:workers]" (ex: "copy:4") em (modo, workers)."""
+    mode, _, workers = spec.partition(":")
+    if mode not in ("upsert", "copy"):
+        raise argparse.ArgumentTypeError(f"Estratégia inválida: {spec}")
+    return mode, int(workers or 1)
+
+
+def parse_mix(value):
+    """Converte "inserção,atualização,deleção" (ex: "0.6,0.3,0.1") em uma tupla."""
+    parts = [float(part) for part in value.split(",")]
+    if len(parts) != 3 or any(part < 0 for part in parts) or not sum(parts):
+        raise argparse.ArgumentTypeError("Use três proporções, ex: 0.6,0.3,0.1")
+    return tuple(parts)
+
+
+def parse_args():
+    """Lê as opções de linha de comando do benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark das estratégias de carga em lote do run_batch."
+    )
+    parser.add_argument("--rows", type=int, default=100_000, help="Operações geradas.")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=(0.6, 0.3, 0.1),
+        help="Proporção inserção,atualização,deleção (padrão: 0.6,0.3,0.1).",
+    )
+    parser.add_argument(
+        "--fk-distribution",
+        choices=["uniform", "zipf"],
+        default="uniform",
+        help="Distribuição de user_id_fk e category_id_fk.",
+    )
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json")
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        type=parse_strategy,
+        default=[parse_strategy(spec) for spec in DEFAULT_STRATEGIES],
+        help="Estratégias no formato modo[:workers] (padrão: upsert copy upsert:4 copy:4).",
+    )
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--output",
+        default="bench_results.json",
+        help="Arquivo JSON com os resultados (padrão: bench_results.json).",
+    )
+    parser.add_argument(
+        "--generate-only",
+        metavar="DIR",
+        help="Apenas gera os arquivos sintéticos em DIR, sem executar a carga.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """
+    Gera dados sintéticos e mede cada estratégia de carga contra o banco
+    configurado no .env. As tarefas sintéticas são removidas ao final de cada
+    estratégia, e os resultados são gravados em JSON.
+    """
+    args = parse_args()
+
+    if not check_db_connection():
+        sys.exit(1)
+
+    init_db()
+    user_ids, category_ids, next_id = _load_fk_ids()
+    if not user_ids or not category_ids:
+        sys.exit("É necessário ter ao menos um usuário e uma categoria cadastrados.")
+
+    if args.generate_only:
+        os.makedirs(args.generate_only, exist_ok=True)
+        dataset = generate_dataset(
+            args.generate_only,
+            args.rows,
+            args.mix,
+            user_ids,
+            category_ids,
+            args.fk_distribution,
+            args.format,
+            next_id,
+            seed=args.seed,
+        )
+        print(json.dumps(dataset, indent=2, ensure_ascii=False))
+        return
+
+    results = []
+    for mode, workers in args.strategies:
+        chunk_size = args.chunk_size or (
+            run_batch.DEFAULT_COPY_CHUNK_SIZE
+            if mode == "copy"
+            else run_batch.DEFAULT_CHUNK_SIZE
+        )
+        token = f"bench-{uuid.uuid4().hex[:8]}"
+        _, _, next_id = _load_fk_ids()
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            dataset = generate_dataset(
+                output_dir,
+                args.rows,
+                args.mix,
+                user_ids,
+                category_ids,
+                args.fk_distribution,
+                args.format,
+                next_id,
+                token,
+                args.seed,
+            )
+            print(f"\n>>> Estratégia {mode} com {workers} worker(s)")
+            try:
+                _seed_dataset(dataset)
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=get_context("spawn")
+                ) as pool:
+                    metrics = pool.submit(
+                        run_strategy, dataset, mode, workers, chunk_size
+                    ).result()
+            finally:
+                _cleanup_dataset(dataset, token)
+
+        results.append(
+            {
+                "strategy": f"{mode}:{workers}",
+                "mode": mode,
+                "workers": workers,
+                "chunk_size": chunk_size,
+                **metrics,
+            }
+        )
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "parameters": {
+            "rows": args.rows,
+            "mix": dict(zip(("insert", "update", "delete"), args.mix)),
+            "fk_distribution": args.fk_distribution,
+            "format": args.format,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print("\n--- Resultados ---")
+    for result in results:
+        print(
+            f"{result['strategy']:>10}: {result['rows_per_second']} linhas/s | "
+            f"{result['elapsed_seconds']}s | pico RSS {result['peak_rss_mb']} MB | "
+            f"{result['statements']} comandos"
+        )
+    print(f"\nResultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+from src.utils.db_session import check_db_connection, init_db, get_db_session
+from src.service.export_service import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_FORMATS,
+    EXPORT_REPORTS,
+    export_report,
+)
+
+
+def parse_args():
+    """Lê o relatório a exportar e as opções do arquivo gerado."""
+    parser = argparse.ArgumentParser(
+        description="Exporta um relatório completo para CSV ou JSONL (gzip)."
+    )
+    parser.add_argument("report", choices=sorted(EXPORT_REPORTS))
+    parser.add_argument(
+        "--format", choices=EXPORT_FORMATS, default="csv", help="Padrão: csv."
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Arquivo de saída (padrão: exports/<relatório>.<formato>.gz).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=EXPORT_BATCH_SIZE,
+        help=f"Linhas buscadas por lote (padrão: {EXPORT_BATCH_SIZE}).",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Exporta o relatório escolhido em streaming, sem carregá-lo na memória."""
+    args = parse_args()
+
+    if not check_db_connection():
+        sys.exit(1)
+
+    init_db()
+
+    output = Path(args.output or f"exports/{args.report}.{args.format}.gz")
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"\n>>> Exportando '{args.report}' para {output}")
+    start = time.perf_counter()
+    db = get_db_session()
+    try:
+        statement = EXPORT_REPORTS[args.report]()
+        rows = export_report(db, statement, str(output), args.format, args.batch_size)
+        print(
+            f"Sucesso! {rows} linhas exportadas em {time.perf_counter() - start:.2f}s."
+        )
+    except Exception as e:
+        print(f"Erro durante a exportação: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
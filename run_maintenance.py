@@ -0,0 +1,190 @@
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from src.utils.db_session import engine, get_db_session, check_db_connection
+from src.utils.migrations import migrate, migration_status
+from src.service.task_counter_service import reconcile_task_counters, find_counter_drift
+from src.service.scraping_stats_service import (
+    reconcile_scraping_stats,
+    find_scraping_stats_drift,
+)
+from src.service.archive_service import (
+    DEFAULT_ARCHIVE_BATCH_SIZE,
+    archive_completed_tasks,
+)
+from src.service.report_views_service import REPORT_VIEWS, refresh_report_view
+
+
+def run_migrate(args):
+    """Aplica as migrações pendentes (até --target, se informado)."""
+    applied = migrate(engine, target=args.target)
+    if applied:
+        print(f"Sucesso! {len(applied)} migrações aplicadas.")
+    else:
+        print("O banco já está atualizado.")
+
+
+def run_status(args):
+    """Lista as migrações conhecidas e quando cada uma foi aplicada."""
+    print("\n--- Migrações ---")
+    for migration, applied_at in migration_status(engine):
+        state = (
+            f"aplicada em {applied_at:%Y-%m-%d %H:%M:%S}" if applied_at else "PENDENTE"
+        )
+        mode = "" if migration.transactional else " (sem transação)"
+        print(f"{migration.version:04d}_{migration.name}{mode}: {state}")
+
+
+def run_reconcile_counters(args):
+    """Confere (e, sem --check, recalcula) task_counter e scraping_stats."""
+    db = get_db_session()
+    try:
+        drift = find_counter_drift(db)
+        for row in drift:
+            print(
+                f"   [DIVERGÊNCIA] Usuário {row.user_id_fk} | Categoria {row.category_id_fk} | "
+                f"Status {row.status}: contador {row.counter_count}, real {row.actual_count}"
+            )
+        stats_drift = find_scraping_stats_drift(db)
+        for name, counter, actual in stats_drift:
+            print(
+                f"   [DIVERGÊNCIA] scraping_stats.{name}: contador {counter}, real {actual}"
+            )
+        print(f"{len(drift) + len(stats_drift)} contadores divergentes encontrados.")
+        if args.check:
+            db.rollback()
+            return
+
+        rows = reconcile_task_counters(db)
+        totals = reconcile_scraping_stats(db)
+        db.commit()
+        print(f"Sucesso! task_counter recalculada com {rows} linhas.")
+        print(
+            f"Sucesso! scraping_stats recalculada: {totals.total_pages} páginas, "
+            f"{totals.total_articles} artigos, {totals.total_errors} erros."
+        )
+    except Exception as e:
+        db.rollback()
+        print(f"Erro ao reconciliar contadores: {e}")
+    finally:
+        db.close()
+
+
+def run_archive(args):
+    """Move as tarefas concluídas antigas para task_archive, em lotes."""
+    cutoff = datetime.now() - timedelta(days=args.older_than_days)
+    print(
+        f"\n>>> Arquivando tarefas concluídas criadas antes de {cutoff:%Y-%m-%d %H:%M}"
+    )
+    db = get_db_session()
+    try:
+        total = archive_completed_tasks(db, cutoff, args.batch_size)
+        print(f"Sucesso! {total} tarefas arquivadas.")
+    except Exception as e:
+        db.rollback()
+        print(f"Erro durante o arquivamento: {e}")
+        print(
+            "Os lotes já confirmados foram mantidos; execute novamente para continuar."
+        )
+    finally:
+        db.close()
+
+
+def run_refresh_reports(args):
+    """Recalcula as materialized views dos relatórios, uma transação por view."""
+    views = args.view or REPORT_VIEWS
+    db = get_db_session()
+    try:
+        for view_name in views:
+            start = time.perf_counter()
+            refresh_report_view(db, view_name, concurrently=args.concurrently)
+            db.commit()
+            print(f"   {view_name} atualizada em {time.perf_counter() - start:.2f}s")
+        print(f"Sucesso! {len(views)} views atualizadas.")
+    except Exception as e:
+        db.rollback()
+        print(f"Erro ao atualizar as views de relatório: {e}")
+    finally:
+        db.close()
+
+
+def parse_args():
+    """Lê o subcomando de manutenção e as suas opções."""
+    parser = argparse.ArgumentParser(description="Tarefas de manutenção do banco.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser(
+        "migrate", help="Aplica as migrações pendentes de sql/migrations."
+    )
+    migrate_parser.add_argument(
+        "--target", type=int, default=None, help="Última versão a aplicar."
+    )
+    migrate_parser.set_defaults(handler=run_migrate)
+
+    status_parser = subparsers.add_parser(
+        "status", help="Mostra as migrações aplicadas e pendentes."
+    )
+    status_parser.set_defaults(handler=run_status)
+
+    reconcile_parser = subparsers.add_parser(
+        "reconcile-counters",
+        help="Recalcula task_counter e scraping_stats a partir das tabelas de origem.",
+    )
+    reconcile_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Apenas lista as divergências, sem alterar a tabela.",
+    )
+    reconcile_parser.set_defaults(handler=run_reconcile_counters)
+
+    archive_parser = subparsers.add_parser(
+        "archive",
+        help="Move tarefas concluídas antigas de task para task_archive.",
+    )
+    archive_parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=30,
+        help="Arquiva tarefas criadas há mais de N dias (padrão: 30).",
+    )
+    archive_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_ARCHIVE_BATCH_SIZE,
+        help=f"Tarefas movidas por transação (padrão: {DEFAULT_ARCHIVE_BATCH_SIZE}).",
+    )
+    archive_parser.set_defaults(handler=run_archive)
+
+    refresh_parser = subparsers.add_parser(
+        "refresh-reports",
+        help="Atualiza as materialized views dos relatórios de scraping.",
+    )
+    refresh_parser.add_argument(
+        "--view",
+        action="append",
+        choices=REPORT_VIEWS,
+        help="Atualiza apenas esta view (pode ser repetido).",
+    )
+    refresh_parser.add_argument(
+        "--no-concurrently",
+        dest="concurrently",
+        action="store_false",
+        help="Usa REFRESH sem CONCURRENTLY (mais rápido, mas bloqueia as leituras).",
+    )
+    refresh_parser.set_defaults(handler=run_refresh_reports)
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if not check_db_connection():
+        sys.exit(1)
+
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,54 +4,55 @@ from src.service.reports_service import (
     get_right_join_report
 )
 from src.utils.db_session import check_db_connection, init_db
+from src.service.report_orchestrator import run_reports_concurrently
+from functools import partial
+import argparse
 import sys
 
-def print_results(report_name: str, query_function):
+def print_results(report_name: str, result):
     """
-    Função auxiliar que executa uma consulta e imprime os resultados
+    Função auxiliar que imprime o resultado materializado de uma consulta
     como Dicionários (Etapas 5, 6) e Listas (Etapas 7, 8).
     
     Argumentos:
         report_name (str): O título a ser impresso para o relatório.
-        query_function (function): A função do serviço que executa a query.
+        result (ReportResult): O resultado da consulta (None em caso de erro).
     """
     
-    print(f"\n--- {report_name} (Resultado como DICIONÁRIO) [Etapas 5 e 6] ---")
-    
-    db_result_dict = query_function()
-    if db_result_dict is None:
-        print("Erro ao executar consulta (dicionário).")
+    if result is None:
+        print(f"\n--- {report_name} ---")
+        print("Erro ao executar consulta.")
         return
     
-    results_dict = db_result_dict.mappings().all()
+    print(f"\n--- {report_name} (Resultado como DICIONÁRIO) [Etapas 5 e 6] ---")
     
-    if not results_dict:
+    if not result:
         print("Nenhum resultado encontrado.")
     else:
-        for item in results_dict:
-            print(dict(item)) 
-            
-    db_result_dict.close() 
+        for item in result.mappings():
+            print(item) 
     
     print(f"\n--- {report_name} (Resultado como LISTA) [Etapas 7 e 8] ---")
     
-    db_result_list = query_function()
-    if db_result_list is None:
-        print("Erro ao executar consulta (lista).")
-        return
-    
-    results_list = db_result_list.all()
-    
-    if not results_list:
+    if not result:
         print("Nenhum resultado encontrado.")
     else:
-        for item in results_list:
+        for item in result.all():
             print(item) 
-            
-    db_result_list.close() 
+
+def parse_args():
+    """Lê as opções de linha de comando dos relatórios."""
+    parser = argparse.ArgumentParser(description="Relatórios do TP3 - Taskfy.")
+    parser.add_argument(
+        "--include-archived",
+        action="store_true",
+        help="Inclui as tarefas arquivadas (task_archive) no relatório RIGHT JOIN.",
+    )
+    return parser.parse_args()
 
 def main():
     """Função principal que orquestra a execução dos relatórios."""
+    args = parse_args()
     
     if not check_db_connection():
         sys.exit(1) 
@@ -61,9 +62,19 @@ def main():
     print("\nExecutando requisitos do TP3 - Taskfy (Relatórios)")
     print("="*50)
     
-    print_results("Relatório 1: INNER JOIN (Tarefas Pendentes)", get_inner_join_report)
-    print_results("Relatório 2: LEFT JOIN (Tarefas por Categoria)", get_left_join_report)
-    print_results("Relatório 3: RIGHT JOIN (Usuários e suas Tarefas)", get_right_join_report)
+    reports = [
+        ("Relatório 1: INNER JOIN (Tarefas Pendentes)", get_inner_join_report),
+        ("Relatório 2: LEFT JOIN (Tarefas por Categoria)", get_left_join_report),
+        (
+            "Relatório 3: RIGHT JOIN (Usuários e suas Tarefas)",
+            partial(get_right_join_report, include_archived=args.include_archived),
+        ),
+    ]
+
+    # As consultas rodam em paralelo; a impressão segue a ordem acima.
+    results = run_reports_concurrently(function for _, function in reports)
+    for (report_name, _), result in zip(reports, results):
+        print_results(report_name, result)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
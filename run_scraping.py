@@ -1,7 +1,9 @@
 import sys
+from functools import partial
 from src.utils.db_session import check_db_connection, init_db
 from src.service.scraping_service import WebScrapingService
 from src.service.scraping_reports_service import ScrapingReportsService
+from src.service.report_orchestrator import run_reports_concurrently
 
 
 def print_separator(title: str = ""):
@@ -19,6 +21,17 @@ def print_separator(title: str = ""):
         print("-" * 70)
 
 
+def print_data_age(result):
+    """
+    Informa o horário dos dados quando o relatório veio de uma materialized view.
+
+    Args:
+        result (ReportResult): O resultado do relatório.
+    """
+    if result.as_of is not None:
+        print(f"(dados de {result.as_of:%Y-%m-%d %H:%M:%S})")
+
+
 def execute_scraping():
     """
     Executa o processo de web scraping em múltiplas URLs.
@@ -55,19 +68,34 @@ def execute_scraping():
             print(f"  - {url}")
 
 
-def generate_reports():
+def generate_reports(fresh: bool = False):
     """
     Gera e exibe relatórios dos dados coletados via scraping.
     Inclui estatísticas gerais e consultas SQL com JOINs.
+
+    Args:
+        fresh (bool): Se True, ignora as materialized views e consulta as
+            tabelas (usado logo após um scraping).
     """
     print_separator("RELATÓRIOS DO WEB SCRAPING")
 
     reports = ScrapingReportsService()
 
+    # As cinco consultas são independentes: rodam em paralelo e são
+    # exibidas abaixo na ordem original.
+    stats, pages, page_errors, errors, authors = run_reports_concurrently(
+        [
+            partial(reports.get_summary_statistics, fast=True),
+            partial(reports.get_pages_with_articles, fresh=fresh),
+            partial(reports.get_pages_with_errors, fresh=fresh),
+            reports.get_all_errors_with_pages,
+            partial(reports.get_articles_by_author, fresh=fresh),
+        ]
+    )
+
     # Estatísticas gerais
     print("\n[1] ESTATÍSTICAS GERAIS")
     print_separator()
-    stats = reports.get_summary_statistics()
     if stats:
         print(f"Total de páginas processadas: {stats['total_pages']}")
         print(f"Total de artigos extraídos: {stats['total_articles']}")
@@ -77,9 +105,9 @@ def generate_reports():
     # Páginas com artigos (INNER JOIN)
     print("\n[2] PÁGINAS COM ARTIGOS (INNER JOIN)")
     print_separator()
-    result = reports.get_pages_with_articles()
-    if result:
-        rows = result.mappings().all()
+    if pages is not None:
+        print_data_age(pages)
+        rows = pages.mappings()
         if rows:
             for row in rows:
                 print(f"\nPágina: {row['page_title']}")
@@ -92,9 +120,9 @@ def generate_reports():
     # Páginas com erros (LEFT JOIN)
     print("\n[3] PÁGINAS E ERROS (LEFT JOIN)")
     print_separator()
-    result = reports.get_pages_with_errors()
-    if result:
-        rows = result.mappings().all()
+    if page_errors is not None:
+        print_data_age(page_errors)
+        rows = page_errors.mappings()
         if rows:
             for row in rows:
                 print(f"\nURL: {row['url']}")
@@ -108,9 +136,8 @@ def generate_reports():
     # Todos os erros
     print("\n[4] HISTÓRICO DE ERROS")
     print_separator()
-    result = reports.get_all_errors_with_pages()
-    if result:
-        rows = result.mappings().all()
+    if errors is not None:
+        rows = errors.mappings()
         if rows:
             for row in rows[:10]:  # Limita a 10 erros mais recentes
                 print(f"\nErro #{row['id_error']}")
@@ -124,9 +151,9 @@ def generate_reports():
     # Artigos por autor
     print("\n[5] ARTIGOS POR AUTOR")
     print_separator()
-    result = reports.get_articles_by_author()
-    if result:
-        rows = result.mappings().all()
+    if authors is not None:
+        print_data_age(authors)
+        rows = authors.mappings()
         if rows:
             for idx, row in enumerate(rows, 1):
                 print(f"{idx}. {row['author']}: {row['article_count']} artigos")
@@ -165,7 +192,7 @@ def main():
             generate_reports()
         elif choice == "3":
             execute_scraping()
-            generate_reports()
+            generate_reports(fresh=True)
         elif choice == "0":
             print("\nEncerrando. Até mais!")
             break
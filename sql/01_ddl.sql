@@ -1,3 +1,5 @@
+-- Esquema inicial do Taskfy. As alterações posteriores (ex: task.status como
+-- SMALLINT) estão em sql/migrations/ e são aplicadas por init_db().
 DROP TABLE IF EXISTS task;
 DROP TABLE IF EXISTS "user";
 DROP TABLE IF EXISTS category;
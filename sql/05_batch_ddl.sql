@@ -0,0 +1,9 @@
+-- Checkpoints das cargas em lote (run_batch.py)
+CREATE TABLE IF NOT EXISTS batch_checkpoint (
+    job_key VARCHAR(600) PRIMARY KEY,
+    file_path VARCHAR(500) NOT NULL,
+    file_hash VARCHAR(64) NOT NULL,
+    record_index BIGINT NOT NULL DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
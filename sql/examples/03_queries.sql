@@ -1,6 +1,13 @@
+-- Consultas de exemplo dos relatórios do TP3, escritas para o esquema já
+-- migrado (status como SMALLINT, migração 0003). Ficam fora de sql/ para não
+-- rodarem no docker-entrypoint-initdb.d, antes das migrações.
+
 -- 4a) INNER JOIN
 SELECT 
-    t.description, t.status, u.name AS user_name, c.category_name
+    t.description,
+    CASE t.status WHEN 0 THEN 'Pendente' WHEN 1 THEN 'Concluída' END AS status,
+    u.name AS user_name,
+    c.category_name
 FROM 
     task t
 INNER JOIN 
@@ -8,7 +15,7 @@ INNER JOIN
 INNER JOIN 
     category c ON t.category_id_fk = c.id_category
 WHERE
-    t.status = 'Pendente';
+    t.status = 0; -- 0 = 'Pendente', 1 = 'Concluída' (migração 0003)
 
 
 -- 4b) LEFT JOIN
@@ -18,7 +25,7 @@ SELECT
 FROM 
     category c
 LEFT JOIN 
-    task t ON c.id_category = t.category_id_fk AND t.status = 'Pendente'
+    task t ON c.id_category = t.category_id_fk AND t.status = 0
 GROUP BY 
     c.category_name
 ORDER BY 
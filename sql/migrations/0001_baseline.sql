@@ -0,0 +1,90 @@
+-- Migração 0001: esquema base do Taskfy (equivalente a 01_ddl.sql, sem os
+-- DROP TABLE, + 04_scraping_ddl.sql + 05_batch_ddl.sql). Idempotente, para
+-- poder ser registrada em bancos já criados pelos scripts de inicialização.
+
+CREATE TABLE IF NOT EXISTS "user" (
+    id_user SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    email VARCHAR(100) UNIQUE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS category (
+    id_category SERIAL PRIMARY KEY,
+    category_name VARCHAR(50) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS task (
+    id_task SERIAL PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    status VARCHAR(20) DEFAULT 'Pendente',
+    creation_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    user_id_fk INT NOT NULL,
+    category_id_fk INT NOT NULL,
+    
+    CONSTRAINT fk_user
+        FOREIGN KEY(user_id_fk) 
+        REFERENCES "user"(id_user),
+    
+    CONSTRAINT fk_category
+        FOREIGN KEY(category_id_fk) 
+        REFERENCES category(id_category)
+);
+
+-- Tabela de páginas visitadas (metadados)
+CREATE TABLE IF NOT EXISTS scraped_page (
+    id_page SERIAL PRIMARY KEY,
+    url VARCHAR(500) NOT NULL UNIQUE,
+    title VARCHAR(255),
+    scraping_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    status_code INTEGER,
+    content_length INTEGER
+);
+
+-- Tabela de artigos/conteúdos extraídos
+CREATE TABLE IF NOT EXISTS scraped_article (
+    id_article SERIAL PRIMARY KEY,
+    page_id_fk INTEGER NOT NULL,
+    title VARCHAR(255),
+    author VARCHAR(100),
+    publish_date VARCHAR(50),
+    content_preview TEXT,
+    article_url VARCHAR(500),
+    extraction_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    CONSTRAINT fk_scraped_page
+        FOREIGN KEY(page_id_fk)
+        REFERENCES scraped_page(id_page)
+        ON DELETE CASCADE
+);
+
+-- Tabela de erros/exceções durante scraping
+CREATE TABLE IF NOT EXISTS scraping_error (
+    id_error SERIAL PRIMARY KEY,
+    page_id_fk INTEGER,
+    url_attempted VARCHAR(500) NOT NULL,
+    error_type VARCHAR(100),
+    error_message TEXT,
+    occurred_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    CONSTRAINT fk_error_page
+        FOREIGN KEY(page_id_fk)
+        REFERENCES scraped_page(id_page)
+        ON DELETE SET NULL
+);
+
+-- Índices para melhorar performance das consultas
+CREATE INDEX IF NOT EXISTS idx_scraped_article_page ON scraped_article(page_id_fk);
+CREATE INDEX IF NOT EXISTS idx_scraping_error_page ON scraping_error(page_id_fk);
+CREATE INDEX IF NOT EXISTS idx_scraped_article_author ON scraped_article(author);
+CREATE INDEX IF NOT EXISTS idx_scraped_page_url ON scraped_page(url);
+
+-- Checkpoints das cargas em lote (run_batch.py)
+CREATE TABLE IF NOT EXISTS batch_checkpoint (
+    job_key VARCHAR(600) PRIMARY KEY,
+    file_path VARCHAR(500) NOT NULL,
+    file_hash VARCHAR(64) NOT NULL,
+    record_index BIGINT NOT NULL DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
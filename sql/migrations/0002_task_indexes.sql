@@ -0,0 +1,15 @@
+-- migrate: no-transaction
+-- Migração 0002: índices de desempenho em "task" para os filtros e JOINs dos
+-- relatórios. Criados com CONCURRENTLY para não bloquear escritas em um banco
+-- em uso (por isso a migração roda fora de transação, um comando por vez).
+-- Se um CREATE INDEX CONCURRENTLY falhar, o índice fica INVALID: remova-o com
+-- DROP INDEX CONCURRENTLY antes de executar a migração novamente.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_status ON task(status);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_user_id_fk ON task(user_id_fk);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_category_id_fk ON task(category_id_fk);
+
+-- Índice parcial para listagens e contagens de tarefas pendentes (ordenadas por ID).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_pending ON task(id_task) WHERE status = 'Pendente';
@@ -0,0 +1,27 @@
+-- Migração 0003: task.status passa de VARCHAR(20) para SMALLINT
+-- (0 = 'Pendente', 1 = 'Concluída'). A conversão entre rótulo e código fica
+-- na aplicação (src/model/task_status.py). O índice parcial de pendentes é
+-- recriado porque o seu predicado compara com o rótulo.
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM task WHERE status NOT IN ('Pendente', 'Concluída')
+    ) THEN
+        RAISE EXCEPTION 'task.status contém valores desconhecidos; corrija-os antes de migrar';
+    END IF;
+END $$;
+
+DROP INDEX IF EXISTS idx_task_pending;
+
+ALTER TABLE task ALTER COLUMN status DROP DEFAULT;
+
+ALTER TABLE task ALTER COLUMN status TYPE SMALLINT USING (
+    CASE status WHEN 'Pendente' THEN 0 WHEN 'Concluída' THEN 1 END
+);
+
+ALTER TABLE task ALTER COLUMN status SET DEFAULT 0;
+
+ALTER TABLE task ADD CONSTRAINT ck_task_status CHECK (status IN (0, 1));
+
+CREATE INDEX idx_task_pending ON task(id_task) WHERE status = 0;
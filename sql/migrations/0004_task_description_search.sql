@@ -0,0 +1,10 @@
+-- migrate: no-transaction
+-- Migração 0004: busca textual em task.description. A coluna tsvector é
+-- gerada pelo próprio banco (GENERATED ... STORED), então fica sincronizada em
+-- qualquer INSERT/UPDATE, inclusive nas cargas do run_batch (upsert e COPY).
+-- O índice GIN é criado com CONCURRENTLY para não bloquear escritas.
+
+ALTER TABLE task ADD COLUMN IF NOT EXISTS description_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('portuguese', description)) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_description_tsv ON task USING GIN (description_tsv);
@@ -0,0 +1,96 @@
+-- Migração 0005: contadores de tarefas por (usuário, categoria, status),
+-- mantidos por triggers de instrução (FOR EACH STATEMENT) com tabelas de
+-- transição. Uma carga em lote gera um único ajuste agregado por comando,
+-- e não um ajuste por linha. Recalculável com `run_maintenance.py reconcile-counters`.
+
+-- Os contadores usam status como chave: linhas sem status passam a 'Pendente'.
+UPDATE task SET status = 0 WHERE status IS NULL;
+ALTER TABLE task ALTER COLUMN status SET NOT NULL;
+
+CREATE TABLE IF NOT EXISTS task_counter (
+    user_id_fk INTEGER NOT NULL,
+    category_id_fk INTEGER NOT NULL,
+    status SMALLINT NOT NULL,
+    task_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id_fk, category_id_fk, status)
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_counter_category ON task_counter(category_id_fk, status);
+
+CREATE OR REPLACE FUNCTION task_counter_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM task_counter;
+        RETURN NULL;
+    END IF;
+
+    -- Chaves em ordem fixa para que transações concorrentes travem as
+    -- linhas de contador na mesma sequência (sem deadlock).
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO task_counter AS c (user_id_fk, category_id_fk, status, task_count)
+        SELECT user_id_fk, category_id_fk, status, COUNT(*)
+        FROM new_rows
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3
+        ON CONFLICT (user_id_fk, category_id_fk, status)
+        DO UPDATE SET task_count = c.task_count + EXCLUDED.task_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE task_counter c SET task_count = c.task_count - d.total
+        FROM (
+            SELECT user_id_fk, category_id_fk, status, COUNT(*) AS total
+            FROM old_rows
+            GROUP BY 1, 2, 3
+            ORDER BY 1, 2, 3
+        ) d
+        WHERE c.user_id_fk = d.user_id_fk
+            AND c.category_id_fk = d.category_id_fk
+            AND c.status = d.status;
+    ELSE
+        INSERT INTO task_counter AS c (user_id_fk, category_id_fk, status, task_count)
+        SELECT user_id_fk, category_id_fk, status, SUM(delta)
+        FROM (
+            SELECT user_id_fk, category_id_fk, status, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT user_id_fk, category_id_fk, status, -1 AS delta FROM old_rows
+        ) d
+        GROUP BY 1, 2, 3
+        HAVING SUM(delta) <> 0
+        ORDER BY 1, 2, 3
+        ON CONFLICT (user_id_fk, category_id_fk, status)
+        DO UPDATE SET task_count = c.task_count + EXCLUDED.task_count;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_task_counter_insert ON task;
+CREATE TRIGGER trg_task_counter_insert
+    AFTER INSERT ON task
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counter_apply();
+
+DROP TRIGGER IF EXISTS trg_task_counter_update ON task;
+CREATE TRIGGER trg_task_counter_update
+    AFTER UPDATE ON task
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counter_apply();
+
+DROP TRIGGER IF EXISTS trg_task_counter_delete ON task;
+CREATE TRIGGER trg_task_counter_delete
+    AFTER DELETE ON task
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counter_apply();
+
+DROP TRIGGER IF EXISTS trg_task_counter_truncate ON task;
+CREATE TRIGGER trg_task_counter_truncate
+    AFTER TRUNCATE ON task
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counter_apply();
+
+-- Carga inicial. O ALTER TABLE acima mantém task bloqueada até o fim da
+-- migração, então nenhuma escrita escapa dos contadores.
+DELETE FROM task_counter;
+INSERT INTO task_counter (user_id_fk, category_id_fk, status, task_count)
+SELECT user_id_fk, category_id_fk, status, COUNT(*)
+FROM task
+GROUP BY 1, 2, 3;
@@ -0,0 +1,24 @@
+-- Migração 0006: tabela fria para tarefas concluídas antigas, movidas de
+-- "task" em lotes por `run_maintenance.py archive`. Mantém a tabela quente
+-- pequena para as consultas de pendentes e os relatórios.
+
+CREATE TABLE IF NOT EXISTS task_archive (
+    id_task INTEGER PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    status SMALLINT NOT NULL,
+    creation_date TIMESTAMP,
+    user_id_fk INT NOT NULL,
+    category_id_fk INT NOT NULL,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT fk_archive_user
+        FOREIGN KEY(user_id_fk)
+        REFERENCES "user"(id_user),
+
+    CONSTRAINT fk_archive_category
+        FOREIGN KEY(category_id_fk)
+        REFERENCES category(id_category)
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_archive_user_id_fk ON task_archive(user_id_fk);
+CREATE INDEX IF NOT EXISTS idx_task_archive_category_id_fk ON task_archive(category_id_fk);
@@ -0,0 +1,56 @@
+-- Migração 0007: materialized views para os relatórios de scraping, que
+-- reagregam tabelas inteiras. Cada view tem um índice único (exigido pelo
+-- REFRESH ... CONCURRENTLY), e a tabela report_refresh guarda o horário do
+-- último refresh de cada uma, usado para medir o quanto os dados estão defasados.
+-- O relatório LEFT JOIN de tarefas já lê de task_counter (migração 0005),
+-- que é mantida em tempo real, e por isso não precisa de view.
+
+CREATE TABLE IF NOT EXISTS report_refresh (
+    view_name VARCHAR(100) PRIMARY KEY,
+    refreshed_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_pages_with_articles AS
+SELECT
+    sp.id_page,
+    sp.url,
+    sp.title AS page_title,
+    sp.scraping_date,
+    COUNT(sa.id_article) AS articles_count
+FROM scraped_page sp
+INNER JOIN scraped_article sa ON sp.id_page = sa.page_id_fk
+GROUP BY sp.id_page, sp.url, sp.title, sp.scraping_date;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_pages_with_articles ON mv_pages_with_articles(id_page);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_pages_with_errors AS
+SELECT
+    sp.id_page,
+    sp.url,
+    sp.title,
+    sp.status_code,
+    COUNT(se.id_error) AS error_count,
+    STRING_AGG(DISTINCT se.error_type, ', ') AS error_types
+FROM scraped_page sp
+LEFT JOIN scraping_error se ON sp.id_page = se.page_id_fk
+GROUP BY sp.id_page, sp.url, sp.title, sp.status_code;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_pages_with_errors ON mv_pages_with_errors(id_page);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_articles_by_author AS
+SELECT
+    sa.author,
+    COUNT(sa.id_article) AS article_count,
+    STRING_AGG(DISTINCT sp.url, ' | ') AS sources
+FROM scraped_article sa
+INNER JOIN scraped_page sp ON sa.page_id_fk = sp.id_page
+WHERE sa.author != 'Unknown'
+GROUP BY sa.author;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_articles_by_author ON mv_articles_by_author(author);
+
+INSERT INTO report_refresh (view_name, refreshed_at) VALUES
+    ('mv_pages_with_articles', now()),
+    ('mv_pages_with_errors', now()),
+    ('mv_articles_by_author', now())
+ON CONFLICT (view_name) DO NOTHING;
@@ -0,0 +1,104 @@
+-- Migração 0008: totais de páginas, artigos e erros de scraping em uma única
+-- linha (scraping_stats), mantidos por triggers de instrução com tabelas de
+-- transição, no mesmo esquema de task_counter (migração 0005). As
+-- estatísticas gerais do scraping passam a ler uma linha em vez de contar
+-- tabelas inteiras. Recalculável com `run_maintenance.py reconcile-counters`.
+
+CREATE TABLE IF NOT EXISTS scraping_stats (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    total_pages BIGINT NOT NULL DEFAULT 0,
+    total_articles BIGINT NOT NULL DEFAULT 0,
+    total_errors BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION scraping_stats_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    delta BIGINT;
+BEGIN
+    -- Em TRUNCATE, delta fica NULL e o COALESCE abaixo zera o total.
+    IF TG_OP = 'INSERT' THEN
+        SELECT COUNT(*) INTO delta FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT -COUNT(*) INTO delta FROM old_rows;
+    END IF;
+
+    IF delta = 0 THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_TABLE_NAME = 'scraped_page' THEN
+        UPDATE scraping_stats SET total_pages = COALESCE(total_pages + delta, 0);
+    ELSIF TG_TABLE_NAME = 'scraped_article' THEN
+        UPDATE scraping_stats SET total_articles = COALESCE(total_articles + delta, 0);
+    ELSE
+        UPDATE scraping_stats SET total_errors = COALESCE(total_errors + delta, 0);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_scraping_stats_insert ON scraped_page;
+CREATE TRIGGER trg_scraping_stats_insert
+    AFTER INSERT ON scraped_page
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION scraping_stats_apply();
+
+DROP TRIGGER IF EXISTS trg_scraping_stats_delete ON scraped_page;
+CREATE TRIGGER trg_scraping_stats_delete
+    AFTER DELETE ON scraped_page
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION scraping_stats_apply();
+
+DROP TRIGGER IF EXISTS trg_scraping_stats_truncate ON scraped_page;
+CREATE TRIGGER trg_scraping_stats_truncate
+    AFTER TRUNCATE ON scraped_page
+    FOR EACH STATEMENT EXECUTE FUNCTION scraping_stats_apply();
+
+DROP TRIGGER IF EXISTS trg_scraping_stats_insert ON scraped_article;
+CREATE TRIGGER trg_scraping_stats_insert
+    AFTER INSERT ON scraped_article
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION scraping_stats_apply();
+
+DROP TRIGGER IF EXISTS trg_scraping_stats_delete ON scraped_article;
+CREATE TRIGGER trg_scraping_stats_delete
+    AFTER DELETE ON scraped_article
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION scraping_stats_apply();
+
+DROP TRIGGER IF EXISTS trg_scraping_stats_truncate ON scraped_article;
+CREATE TRIGGER trg_scraping_stats_truncate
+    AFTER TRUNCATE ON scraped_article
+    FOR EACH STATEMENT EXECUTE FUNCTION scraping_stats_apply();
+
+DROP TRIGGER IF EXISTS trg_scraping_stats_insert ON scraping_error;
+CREATE TRIGGER trg_scraping_stats_insert
+    AFTER INSERT ON scraping_error
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION scraping_stats_apply();
+
+DROP TRIGGER IF EXISTS trg_scraping_stats_delete ON scraping_error;
+CREATE TRIGGER trg_scraping_stats_delete
+    AFTER DELETE ON scraping_error
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION scraping_stats_apply();
+
+DROP TRIGGER IF EXISTS trg_scraping_stats_truncate ON scraping_error;
+CREATE TRIGGER trg_scraping_stats_truncate
+    AFTER TRUNCATE ON scraping_error
+    FOR EACH STATEMENT EXECUTE FUNCTION scraping_stats_apply();
+
+-- Carga inicial, com as tabelas bloqueadas para escrita até o fim da
+-- migração para que nenhuma inserção escape dos totais.
+LOCK TABLE scraped_page, scraped_article, scraping_error IN SHARE ROW EXCLUSIVE MODE;
+INSERT INTO scraping_stats (id, total_pages, total_articles, total_errors)
+SELECT
+    1,
+    (SELECT COUNT(*) FROM scraped_page),
+    (SELECT COUNT(*) FROM scraped_article),
+    (SELECT COUNT(*) FROM scraping_error)
+ON CONFLICT (id) DO UPDATE SET
+    total_pages = EXCLUDED.total_pages,
+    total_articles = EXCLUDED.total_articles,
+    total_errors = EXCLUDED.total_errors;
@@ -0,0 +1,8 @@
+-- migrate: no-transaction
+-- Migração 0009: índice das candidatas ao arquivamento (concluídas, em ordem
+-- de criação), usado pelo comando `archive`. Fica fora da 0006 porque é criado
+-- em "task", a tabela quente: com CONCURRENTLY, não bloqueia escritas.
+-- Se o CREATE INDEX CONCURRENTLY falhar, o índice fica INVALID: remova-o com
+-- DROP INDEX CONCURRENTLY antes de executar a migração novamente.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_completed_creation ON task(creation_date) WHERE status = 1;
@@ -3,4 +3,9 @@ from .base import Base
 from .user import User
 from .category import Category
 from .task import Task
-from .scraping_models import ScrapedPage, ScrapedArticle, ScrapingError
+from .task_status import TaskStatus, STATUS_PENDING, STATUS_COMPLETED
+from .scraping_models import ScrapedPage, ScrapedArticle, ScrapingError, ScrapingStats
+from .batch_checkpoint import BatchCheckpoint
+from .task_snapshot import TaskSnapshot
+from .task_counter import TaskCounter
+from .task_archive import TaskArchive
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, String, BigInteger, Boolean, TIMESTAMP
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class BatchCheckpoint(Base):
+    """
+    Representa o progresso salvo de uma carga em lote (run_batch).
+    Esta classe será mapeada para a tabela "batch_checkpoint".
+
+    O checkpoint é gravado na mesma transação de cada bloco processado, então
+    ele sempre corresponde exatamente ao que já foi confirmado no banco.
+
+    Attributes:
+        job_key (str): Identificador da carga: fase, arquivo e partição (Chave Primária).
+        file_path (str): O caminho do arquivo de entrada.
+        file_hash (str): O hash SHA-256 do conteúdo do arquivo.
+        record_index (int): A posição do próximo registro a processar no arquivo.
+        completed (bool): Indica se a partição foi processada até o fim.
+        updated_at (datetime): A data e hora da última atualização.
+    """
+
+    __tablename__ = "batch_checkpoint"
+
+    job_key = Column(String(600), primary_key=True)
+    file_path = Column(String(500), nullable=False)
+    file_hash = Column(String(64), nullable=False)
+    record_index = Column(BigInteger, nullable=False, default=0)
+    completed = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    def __str__(self):
+        """Retorna uma representação amigável do checkpoint em string."""
+        return f"{self.job_key} | Registro: {self.record_index} | Concluído: {self.completed}"
@@ -1,4 +1,13 @@
-from sqlalchemy import Column, Integer, String, TIMESTAMP, Text, ForeignKey
+from sqlalchemy import (
+    Column,
+    Integer,
+    SmallInteger,
+    BigInteger,
+    String,
+    TIMESTAMP,
+    Text,
+    ForeignKey,
+)
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -99,3 +108,34 @@ class ScrapingError(Base):
         return (
             f"ID: {self.id_error} | Tipo: {self.error_type} | URL: {self.url_attempted}"
         )
+
+
+class ScrapingStats(Base):
+    """
+    Representa os totais gerais do scraping, em uma única linha.
+    Esta classe será mapeada para a tabela "scraping_stats".
+
+    A linha é mantida por triggers nas tabelas de scraping (migração 0008) e
+    nunca deve ser alterada pela aplicação; use `reconcile_scraping_stats`
+    para recalculá-la.
+
+    Attributes:
+        id (int): Sempre 1 (Chave Primária).
+        total_pages (int): A quantidade de páginas processadas.
+        total_articles (int): A quantidade de artigos extraídos.
+        total_errors (int): A quantidade de erros registrados.
+    """
+
+    __tablename__ = "scraping_stats"
+
+    id = Column(SmallInteger, primary_key=True, default=1)
+    total_pages = Column(BigInteger, nullable=False, default=0)
+    total_articles = Column(BigInteger, nullable=False, default=0)
+    total_errors = Column(BigInteger, nullable=False, default=0)
+
+    def __str__(self):
+        """Retorna uma representação amigável dos totais em string."""
+        return (
+            f"Páginas: {self.total_pages} | Artigos: {self.total_articles} | "
+            f"Erros: {self.total_errors}"
+        )
@@ -1,7 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, TIMESTAMP
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Integer, String, ForeignKey, TIMESTAMP
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from .base import Base
+from .task_status import TaskStatus, STATUS_PENDING
+
+# Configuração de idioma da busca textual (ver migração 0004).
+SEARCH_CONFIG = "portuguese"
 
 
 class Task(Base):
@@ -12,19 +17,28 @@ class Task(Base):
     Attributes:
         id_task (int): O identificador único da tarefa (Chave Primária).
         description (str): A descrição do que precisa ser feito.
-        status (str): O estado atual da tarefa (ex: 'Pendente', 'Concluída').
+        status (str): O estado atual da tarefa (ex: 'Pendente', 'Concluída'),
+            gravado como SMALLINT (ver `TaskStatus`).
         creation_date (datetime): A data e hora em que a tarefa foi criada.
         user_id_fk (int): Chave estrangeira para o usuário.
         category_id_fk (int): Chave estrangeira para a categoria.
+        description_tsv: Vetor de busca textual da descrição, gerado pelo
+            banco (carregado apenas sob demanda).
     """
 
     __tablename__ = "task"
     id_task = Column(Integer, primary_key=True)
     description = Column(String(255), nullable=False)
-    status = Column(String(20), default="Pendente")
+    status = Column(TaskStatus(), nullable=False, default=STATUS_PENDING)
     creation_date = Column(TIMESTAMP, server_default=func.now())
     user_id_fk = Column(Integer, ForeignKey("user.id_user"), nullable=False)
     category_id_fk = Column(Integer, ForeignKey("category.id_category"), nullable=False)
+    description_tsv = deferred(
+        Column(
+            TSVECTOR,
+            Computed(f"to_tsvector('{SEARCH_CONFIG}', description)", persisted=True),
+        )
+    )
     user = relationship("User", back_populates="tasks")
     category = relationship("Category", back_populates="tasks")
 
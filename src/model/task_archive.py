@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, TIMESTAMP
+from sqlalchemy.sql import func
+from .base import Base
+from .task_status import TaskStatus
+
+
+class TaskArchive(Base):
+    """
+    Representa uma tarefa concluída movida para o arquivo (tabela fria).
+    Esta classe será mapeada para a tabela "task_archive".
+
+    Tem as mesmas colunas de `Task`, mais a data do arquivamento.
+
+    Attributes:
+        id_task (int): O identificador original da tarefa (Chave Primária).
+        description (str): A descrição da tarefa.
+        status (str): O status da tarefa no arquivamento ('Concluída').
+        creation_date (datetime): A data e hora em que a tarefa foi criada.
+        user_id_fk (int): Chave estrangeira para o usuário.
+        category_id_fk (int): Chave estrangeira para a categoria.
+        archived_at (datetime): A data e hora em que a tarefa foi arquivada.
+    """
+
+    __tablename__ = "task_archive"
+
+    id_task = Column(Integer, primary_key=True)
+    description = Column(String(255), nullable=False)
+    status = Column(TaskStatus(), nullable=False)
+    creation_date = Column(TIMESTAMP)
+    user_id_fk = Column(Integer, ForeignKey("user.id_user"), nullable=False)
+    category_id_fk = Column(Integer, ForeignKey("category.id_category"), nullable=False)
+    archived_at = Column(TIMESTAMP, server_default=func.now())
+
+    def __str__(self):
+        """Retorna uma representação amigável da tarefa arquivada em string."""
+        return f"ID: {self.id_task} | Status: {self.status} (arquivada) | Descrição: {self.description}"
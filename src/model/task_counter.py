@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, BigInteger
+from .base import Base
+from .task_status import TaskStatus
+
+
+class TaskCounter(Base):
+    """
+    Representa a quantidade de tarefas de um usuário em uma categoria e status.
+    Esta classe será mapeada para a tabela "task_counter".
+
+    A tabela é mantida por triggers em "task" (migração 0005) e nunca deve
+    ser alterada pela aplicação; use `reconcile_task_counters` para recalculá-la.
+
+    Attributes:
+        user_id_fk (int): O ID do usuário (Chave Primária composta).
+        category_id_fk (int): O ID da categoria (Chave Primária composta).
+        status (str): O status das tarefas contadas (Chave Primária composta).
+        task_count (int): A quantidade de tarefas.
+    """
+
+    __tablename__ = "task_counter"
+
+    user_id_fk = Column(Integer, primary_key=True)
+    category_id_fk = Column(Integer, primary_key=True)
+    status = Column(TaskStatus(), primary_key=True)
+    task_count = Column(BigInteger, nullable=False, default=0)
+
+    def __str__(self):
+        """Retorna uma representação amigável do contador em string."""
+        return (
+            f"Usuário {self.user_id_fk} | Categoria {self.category_id_fk} | "
+            f"{self.status}: {self.task_count}"
+        )
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import NamedTuple
+
+
+class TaskSnapshot(NamedTuple):
+    """
+    Cópia imutável e desanexada de uma tarefa, segura para ser guardada em
+    cache e compartilhada entre sessões (não acessa o banco).
+
+    Attributes:
+        id_task (int): O identificador único da tarefa.
+        description (str): A descrição do que precisa ser feito.
+        status (str): O estado atual da tarefa (ex: 'Pendente', 'Concluída').
+        creation_date (datetime): A data e hora em que a tarefa foi criada.
+        user_id_fk (int): Chave estrangeira para o usuário.
+        category_id_fk (int): Chave estrangeira para a categoria.
+        user_name (str): Nome do usuário (apenas nas listagens projetadas).
+        category_name (str): Nome da categoria (apenas nas listagens projetadas).
+        archived (bool): True se a tarefa veio de `task_archive`.
+    """
+
+    id_task: int
+    description: str
+    status: str
+    creation_date: datetime | None
+    user_id_fk: int
+    category_id_fk: int
+    user_name: str | None = None
+    category_name: str | None = None
+    archived: bool = False
+
+    @classmethod
+    def from_task(cls, task, archived: bool = False) -> "TaskSnapshot":
+        """
+        Cria um snapshot a partir de um objeto `Task` carregado (ou de um
+        `TaskArchive`, com `archived=True`).
+        """
+        return cls(
+            id_task=task.id_task,
+            description=task.description,
+            status=task.status,
+            creation_date=task.creation_date,
+            user_id_fk=task.user_id_fk,
+            category_id_fk=task.category_id_fk,
+            archived=archived,
+        )
+
+    def __str__(self):
+        """Retorna uma representação amigável da tarefa em string."""
+        status = f"{self.status} (arquivada)" if self.archived else self.status
+        return f"ID: {self.id_task} | Status: {status} | Descrição: {self.description}"
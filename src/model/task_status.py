@@ -0,0 +1,41 @@
+from sqlalchemy import SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+STATUS_PENDING = "Pendente"
+STATUS_COMPLETED = "Concluída"
+
+# Único ponto de conversão entre o rótulo exibido e o código gravado no banco.
+STATUS_CODES = {STATUS_PENDING: 0, STATUS_COMPLETED: 1}
+STATUS_LABELS = {code: label for label, code in STATUS_CODES.items()}
+
+
+def status_code(label: str | None) -> int | None:
+    """
+    Converte o rótulo de um status ('Pendente', 'Concluída') no seu código.
+
+    Raises:
+        ValueError: Se o rótulo não for um status conhecido.
+    """
+    if label is None:
+        return None
+    try:
+        return STATUS_CODES[label]
+    except KeyError:
+        raise ValueError(f"Status de tarefa inválido: {label!r}") from None
+
+
+class TaskStatus(TypeDecorator):
+    """
+    Tipo da coluna `task.status`: grava um SMALLINT (0 = 'Pendente',
+    1 = 'Concluída') e expõe para a aplicação os rótulos de sempre, inclusive
+    em filtros como `Task.status == 'Pendente'`.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return status_code(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else STATUS_LABELS[value]
@@ -0,0 +1,83 @@
+from datetime import datetime
+from sqlalchemy import bindparam, text
+from src.model.task_status import TaskStatus, STATUS_COMPLETED
+
+DEFAULT_ARCHIVE_BATCH_SIZE = 1000
+
+
+def archive_tasks_batch(db, cutoff: datetime, batch_size: int) -> list[int]:
+    """
+    Move um lote de tarefas concluídas criadas antes de `cutoff` de `task`
+    para `task_archive`, com um único comando (DELETE ... RETURNING
+    alimentando o INSERT). Linhas travadas por outras transações são puladas
+    (SKIP LOCKED) e ficam para o próximo lote. Se o ID já estiver arquivado
+    (a tarefa foi recriada com o mesmo ID), a versão arquivada é substituída.
+
+    Args:
+        db: Sessão do banco de dados (o commit fica a cargo de quem chama).
+        cutoff (datetime): Apenas tarefas criadas antes desta data são movidas.
+        batch_size (int): Quantidade máxima de tarefas movidas.
+
+    Returns:
+        list[int]: Os IDs das tarefas arquivadas.
+    """
+    query = text(
+        """
+        WITH moved AS (
+            DELETE FROM task
+            WHERE id_task IN (
+                SELECT id_task
+                FROM task
+                WHERE status = :completed AND creation_date < :cutoff
+                ORDER BY creation_date
+                LIMIT :batch_size
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id_task, description, status, creation_date,
+                user_id_fk, category_id_fk
+        )
+        INSERT INTO task_archive
+            (id_task, description, status, creation_date, user_id_fk, category_id_fk)
+        SELECT id_task, description, status, creation_date, user_id_fk, category_id_fk
+        FROM moved
+        ON CONFLICT (id_task) DO UPDATE SET
+            description = EXCLUDED.description,
+            status = EXCLUDED.status,
+            creation_date = EXCLUDED.creation_date,
+            user_id_fk = EXCLUDED.user_id_fk,
+            category_id_fk = EXCLUDED.category_id_fk,
+            archived_at = CURRENT_TIMESTAMP
+        RETURNING id_task;
+    """
+    ).bindparams(bindparam("completed", STATUS_COMPLETED, type_=TaskStatus()))
+
+    result = db.execute(query, {"cutoff": cutoff, "batch_size": batch_size})
+    return list(result.scalars())
+
+
+def archive_completed_tasks(
+    db, cutoff: datetime, batch_size: int = DEFAULT_ARCHIVE_BATCH_SIZE
+) -> int:
+    """
+    Arquiva, em lotes de `batch_size` confirmados um a um, todas as tarefas
+    concluídas criadas antes de `cutoff`. Cada lote é uma transação curta, e
+    uma execução interrompida pode simplesmente ser repetida. O cache de
+    tarefas não é invalidado aqui: ele é por processo, e este comando roda em
+    um processo próprio (as entradas expiram pelo TTL).
+
+    Args:
+        db: Sessão do banco de dados.
+        cutoff (datetime): Apenas tarefas criadas antes desta data são movidas.
+        batch_size (int): Quantidade de tarefas por lote.
+
+    Returns:
+        int: A quantidade total de tarefas arquivadas.
+    """
+    total = 0
+    while True:
+        archived_ids = archive_tasks_batch(db, cutoff, batch_size)
+        db.commit()
+        if not archived_ids:
+            return total
+        total += len(archived_ids)
+        print(f"   [ARQUIVO] {len(archived_ids)} tarefas movidas para task_archive.")
@@ -0,0 +1,379 @@
+from contextlib import asynccontextmanager
+from src.model.task import Task
+from src.model.task_archive import TaskArchive
+from src.model.task_snapshot import TaskSnapshot
+from src.utils.db_session import get_async_db_session
+from src.utils.cache import get_task_cache, invalidate_tasks_on_commit
+from src.service.batch_service import iter_chunks
+from src.service.task_service import (
+    DEFAULT_PAGE_SIZE,
+    BULK_CHUNK_SIZE,
+    DEFAULT_SEARCH_LIMIT,
+    insert_task_statement,
+    insert_tasks_statement,
+    task_list_statement,
+    task_page_statement,
+    task_snapshot_page_statement,
+    complete_task_statement,
+    complete_tasks_statement,
+    delete_task_statement,
+    delete_tasks_statement,
+    task_search_statement,
+    search_page,
+)
+
+
+class AsyncTaskService:
+    """
+    Versão assíncrona (asyncio) do `TaskService`, com os mesmos métodos e
+    comportamento, usando o engine asyncpg de `db_session`.
+
+    Por padrão, cada método abre, confirma e fecha a sua própria sessão. Se
+    uma sessão for informada (ex: de `async_session_scope()`), todos os métodos
+    a reutilizam: as alterações são apenas enviadas (flush) e o commit ou
+    rollback fica a cargo da unidade de trabalho, e erros são propagados.
+    """
+
+    def __init__(self, session=None):
+        """
+        Inicializa o serviço de tarefas assíncrono.
+
+        Args:
+            session: AsyncSession compartilhada de uma unidade de trabalho (opcional).
+        """
+        self.session = session
+
+    @asynccontextmanager
+    async def _session(self):
+        """
+        Fornece a sessão da unidade de trabalho ou uma sessão própria,
+        fechada ao final.
+        (Função auxiliar interna)
+        """
+        if self.session is not None:
+            yield self.session
+            return
+
+        db = get_async_db_session()
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    async def _commit(self, db_session, task_ids):
+        """
+        Confirma a sessão própria ou apenas faz flush na unidade de trabalho.
+        As tarefas alteradas saem do cache logo após o commit, seja ele feito
+        aqui ou, na unidade de trabalho, por quem a controla.
+        (Função auxiliar interna)
+        """
+        invalidate_tasks_on_commit(db_session, task_ids)
+        if self.session is None:
+            await db_session.commit()
+        else:
+            await db_session.flush()
+
+    async def add_task(
+        self, description: str, user_id: int, category_id: int
+    ) -> Task | None:
+        """
+        Cria e adiciona uma nova tarefa ao banco, com um único INSERT ... RETURNING.
+
+        Args:
+            description (str): A descrição da tarefa.
+            user_id (int): O ID do usuário associado.
+            category_id (int): O ID da categoria associada.
+
+        Returns:
+            Task: O objeto da tarefa que foi criada, ou None se falhar.
+        """
+        async with self._session() as db:
+            try:
+                stmt = insert_task_statement(description, user_id, category_id)
+                new_task = (await db.execute(stmt)).scalar_one()
+                await self._commit(db, [new_task.id_task])
+                return new_task
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                await db.rollback()
+                print(f"Erro ao adicionar tarefa: {e}")
+                return None
+
+    async def list_all_tasks(self) -> list[Task]:
+        """
+        Retorna uma lista de TODAS as tarefas do banco de dados.
+
+        Returns:
+            list[Task]: Uma lista de objetos Task.
+        """
+        async with self._session() as db:
+            tasks = (await db.scalars(task_list_statement())).all()
+            return tasks
+
+    async def list_pending_tasks(self) -> list[Task]:
+        """
+        Retorna uma lista de todas as tarefas com o status 'Pendente'.
+        """
+        async with self._session() as db:
+            stmt = task_list_statement(pending_only=True)
+            tasks = (await db.scalars(stmt)).all()
+            return tasks
+
+    async def _iter_task_pages(
+        self, pending_only: bool, page_size: int, snapshots: bool = False
+    ):
+        """
+        Percorre as tarefas em páginas ordenadas por `id_task` (keyset), com a
+        sessão aberta apenas durante a busca de cada página. Com `snapshots`,
+        cada página é montada como `TaskSnapshot`.
+        (Função auxiliar interna)
+        """
+        last_id = None
+        while True:
+            async with self._session() as db:
+                if snapshots:
+                    stmt = task_snapshot_page_statement(
+                        pending_only, last_id, page_size
+                    )
+                    page = [TaskSnapshot(*row) for row in await db.execute(stmt)]
+                else:
+                    stmt = task_page_statement(pending_only, last_id, page_size)
+                    page = (await db.scalars(stmt)).all()
+
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            last_id = page[-1].id_task
+
+    def iter_all_tasks(self, page_size: int = DEFAULT_PAGE_SIZE):
+        """
+        Versão iterável de `list_all_tasks` (use com `async for`).
+
+        Args:
+            page_size (int): Quantidade de tarefas por página.
+
+        Yields:
+            list[Task]: A próxima página de tarefas, em ordem de ID.
+        """
+        return self._iter_task_pages(False, page_size)
+
+    def iter_pending_tasks(self, page_size: int = DEFAULT_PAGE_SIZE):
+        """
+        Versão iterável de `list_pending_tasks` (use com `async for`).
+
+        Args:
+            page_size (int): Quantidade de tarefas por página.
+
+        Yields:
+            list[Task]: A próxima página de tarefas pendentes, em ordem de ID.
+        """
+        return self._iter_task_pages(True, page_size)
+
+    def iter_task_snapshots(
+        self, pending_only: bool = False, page_size: int = DEFAULT_PAGE_SIZE
+    ):
+        """
+        Versão leve das listagens (use com `async for`): páginas de
+        `TaskSnapshot`, com uma única consulta por página e sem objetos ORM.
+
+        Args:
+            pending_only (bool): Se True, retorna apenas as tarefas pendentes.
+            page_size (int): Quantidade de tarefas por página.
+
+        Yields:
+            list[TaskSnapshot]: A próxima página de tarefas, em ordem de ID.
+        """
+        return self._iter_task_pages(pending_only, page_size, snapshots=True)
+
+    async def search_tasks(
+        self, query: str, limit: int = DEFAULT_SEARCH_LIMIT, cursor: str | None = None
+    ) -> tuple[list[TaskSnapshot], str | None]:
+        """
+        Busca tarefas pela descrição, ordenadas por relevância e paginadas por
+        cursor (mesmas regras de `TaskService.search_tasks`).
+
+        Args:
+            query (str): Termos de busca.
+            limit (int): Quantidade máxima de tarefas por página.
+            cursor (str): Cursor retornado pela página anterior (opcional).
+
+        Returns:
+            tuple[list[TaskSnapshot], str | None]: As tarefas da página e o cursor
+            da próxima página (None se não houver mais resultados).
+        """
+        async with self._session() as db:
+            try:
+                stmt = task_search_statement(query, limit, cursor)
+                return search_page(await db.execute(stmt), limit)
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                print(f"Erro ao buscar tarefas: {e}")
+                return [], None
+
+    async def get_task_by_id(
+        self, task_id: int, include_archived: bool = False
+    ) -> Task | TaskSnapshot | None:
+        """
+        Busca e retorna uma única tarefa pelo seu ID, passando pelo cache de
+        tarefas quando ativo (mesmas regras de `TaskService.get_task_by_id`).
+
+        Args:
+            task_id (int): O ID da tarefa a ser encontrada.
+            include_archived (bool): Se True, procura também nas tarefas arquivadas.
+
+        Returns:
+            Task, TaskSnapshot or None: A tarefa se encontrada, caso contrário None.
+        """
+        cache = get_task_cache() if self.session is None else None
+        if cache is not None:
+            snapshot = cache.get(task_id)
+            if snapshot is not None:
+                return snapshot
+
+        async with self._session() as db:
+            try:
+                task = await db.get(Task, task_id)
+                if task is None and include_archived:
+                    archived_task = await db.get(TaskArchive, task_id)
+                    return (
+                        TaskSnapshot.from_task(archived_task, archived=True)
+                        if archived_task
+                        else None
+                    )
+                if task is not None and cache is not None:
+                    snapshot = TaskSnapshot.from_task(task)
+                    cache.set(task_id, snapshot)
+                    return snapshot
+                return task
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                print(f"Erro ao buscar tarefa: {e}")
+                return None
+
+    async def mark_task_as_completed(self, task_id: int) -> bool:
+        """
+        Altera o status de uma tarefa para 'Concluída' no banco, com um único
+        UPDATE ... RETURNING.
+        """
+        async with self._session() as db:
+            try:
+                stmt = complete_task_statement(task_id)
+                updated_id = (await db.execute(stmt)).scalar_one_or_none()
+                if updated_id is None:
+                    return False
+                await self._commit(db, [updated_id])
+                return True
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                await db.rollback()
+                print(f"Erro ao marcar tarefa como concluída: {e}")
+                return False
+
+    async def delete_task(self, task_id: int) -> bool:
+        """
+        Remove uma tarefa do banco de dados, com um único DELETE ... RETURNING.
+        """
+        async with self._session() as db:
+            try:
+                stmt = delete_task_statement(task_id)
+                deleted_id = (await db.execute(stmt)).scalar_one_or_none()
+                if deleted_id is None:
+                    return False
+                await self._commit(db, [deleted_id])
+                return True
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                await db.rollback()
+                print(f"Erro ao deletar tarefa: {e}")
+                return False
+
+    async def add_tasks(
+        self, tasks: list[tuple[str, int, int]], chunk_size: int = BULK_CHUNK_SIZE
+    ) -> list[int]:
+        """
+        Cria várias tarefas de uma vez, com um INSERT de múltiplas linhas por bloco.
+
+        Args:
+            tasks (list[tuple[str, int, int]]): Tuplas (descrição, ID do usuário, ID da categoria).
+            chunk_size (int): Quantidade de tarefas por comando.
+
+        Returns:
+            list[int]: Os IDs das tarefas criadas (lista vazia se falhar).
+        """
+        async with self._session() as db:
+            try:
+                created_ids = []
+                for chunk in iter_chunks(tasks, chunk_size):
+                    result = await db.execute(insert_tasks_statement(chunk))
+                    created_ids.extend(result.scalars())
+                await self._commit(db, created_ids)
+                return created_ids
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                await db.rollback()
+                print(f"Erro ao adicionar tarefas: {e}")
+                return []
+
+    async def complete_tasks(
+        self, task_ids: list[int], chunk_size: int = BULK_CHUNK_SIZE
+    ) -> list[int]:
+        """
+        Marca várias tarefas como 'Concluída', com um UPDATE ... RETURNING por bloco.
+
+        Args:
+            task_ids (list[int]): Os IDs das tarefas.
+            chunk_size (int): Quantidade de IDs por comando.
+
+        Returns:
+            list[int]: Os IDs efetivamente atualizados.
+        """
+        async with self._session() as db:
+            try:
+                completed_ids = []
+                for chunk in iter_chunks(task_ids, chunk_size):
+                    result = await db.execute(complete_tasks_statement(chunk))
+                    completed_ids.extend(result.scalars())
+                await self._commit(db, completed_ids)
+                return completed_ids
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                await db.rollback()
+                print(f"Erro ao concluir tarefas: {e}")
+                return []
+
+    async def delete_tasks(
+        self, task_ids: list[int], chunk_size: int = BULK_CHUNK_SIZE
+    ) -> list[int]:
+        """
+        Remove várias tarefas, com um DELETE ... RETURNING por bloco.
+
+        Args:
+            task_ids (list[int]): Os IDs das tarefas.
+            chunk_size (int): Quantidade de IDs por comando.
+
+        Returns:
+            list[int]: Os IDs efetivamente removidos.
+        """
+        async with self._session() as db:
+            try:
+                deleted_ids = []
+                for chunk in iter_chunks(task_ids, chunk_size):
+                    result = await db.execute(delete_tasks_statement(chunk))
+                    deleted_ids.extend(result.scalars())
+                await self._commit(db, deleted_ids)
+                return deleted_ids
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                await db.rollback()
+                print(f"Erro ao deletar tarefas: {e}")
+                return []
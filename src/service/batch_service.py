@@ -0,0 +1,647 @@
+import hashlib
+import json
+import os
+from itertools import islice
+from sqlalchemy import column, func, select, text, update, values
+from sqlalchemy.dialects.postgresql import insert
+from src.model.task import Task
+from src.model.task_status import STATUS_CODES, status_code
+from src.model.batch_checkpoint import BatchCheckpoint
+
+TASK_FIELDS = ("description", "status", "user_id_fk", "category_id_fk")
+REQUIRED_FIELDS = ("description", "user_id_fk", "category_id_fk")
+COPY_COLUMNS = ("id_task", *TASK_FIELDS)
+DEFAULT_STAGING_TABLE = "task_staging"
+DESCRIPTION_MAX_LENGTH = Task.__table__.c.description.type.length
+
+
+def iter_chunks(iterable, chunk_size: int):
+    """
+    Agrupa os itens de um iterável em listas de até `chunk_size` elementos.
+
+    Args:
+        iterable: Qualquer iterável (lista, gerador, etc.).
+        chunk_size (int): Tamanho máximo de cada bloco.
+
+    Yields:
+        list: O próximo bloco de itens.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _statement_batches(items: list[dict]):
+    """
+    Divide um bloco de registros em lotes que cabem em um único comando.
+
+    Registros de um mesmo lote possuem o mesmo conjunto de campos (para que
+    campos ausentes no JSON não sobrescrevam valores existentes) e IDs
+    distintos (o PostgreSQL não permite atualizar a mesma linha duas vezes
+    no mesmo comando). A ordem relativa de IDs repetidos é preservada.
+    (Função auxiliar interna)
+    """
+    pending = {}
+    seen_ids = set()
+
+    for item in items:
+        row = {field: item[field] for field in TASK_FIELDS if field in item}
+        task_id = item.get("id_task")
+
+        if task_id:
+            if task_id in seen_ids:
+                yield from pending.values()
+                pending = {}
+                seen_ids = set()
+            seen_ids.add(task_id)
+            row["id_task"] = task_id
+
+        pending.setdefault(frozenset(row), []).append(row)
+
+    yield from pending.values()
+
+
+def _execute_insert(db, rows: list[dict]) -> int:
+    """
+    Insere o lote com um único INSERT de múltiplas linhas. O `id_task` dos
+    registros é descartado: como no processamento original, a tarefa nova
+    recebe o próximo ID da sequência.
+    (Função auxiliar interna)
+
+    Returns:
+        int: Quantidade de tarefas inseridas.
+    """
+    rows = [
+        {field: row[field] for field in TASK_FIELDS if field in row} for row in rows
+    ]
+    db.execute(insert(Task.__table__).values(rows))
+    return len(rows)
+
+
+def _execute_update(db, rows: list[dict]) -> tuple[int, int]:
+    """
+    Atualiza, em um único UPDATE ... FROM (VALUES ...), os registros com ID,
+    alterando apenas os campos presentes no lote. Registros cujo ID não
+    existe em `task` são inseridos como tarefas novas (ver `_execute_insert`).
+    (Função auxiliar interna)
+
+    Returns:
+        tuple[int, int]: (inseridas, atualizadas).
+    """
+    table = Task.__table__
+    fields = [field for field in TASK_FIELDS if field in rows[0]]
+    source = values(
+        *(column(name, table.c[name].type) for name in ["id_task", *fields]),
+        name="source",
+    ).data([tuple(row[name] for name in ["id_task", *fields]) for row in rows])
+
+    stmt = (
+        update(table)
+        .where(table.c.id_task == source.c.id_task)
+        .values(
+            {field: source.c[field] for field in fields}
+            or {"id_task": source.c.id_task}
+        )
+        .returning(table.c.id_task)
+    )
+    updated_ids = set(db.execute(stmt).scalars())
+
+    missing = [row for row in rows if row["id_task"] not in updated_ids]
+    inserted = _execute_insert(db, missing) if missing else 0
+    return inserted, len(updated_ids)
+
+
+def upsert_tasks_chunk(db, items: list[dict]) -> tuple[int, int]:
+    """
+    Realiza o Upsert de um bloco de tarefas com comandos set-based.
+
+    Cada bloco é enviado como um UPDATE ... FROM (VALUES ...) para os
+    registros com ID e um INSERT de múltiplas linhas para os novos, em vez de
+    um SELECT e um INSERT/UPDATE por item. Campos ausentes em um registro
+    mantêm o valor atual da tarefa, e registros com um ID inexistente viram
+    tarefas novas, com ID gerado pela sequência.
+
+    Args:
+        db: Sessão do banco de dados (o commit fica a cargo de quem chama).
+        items (list[dict]): Registros no formato de `upsert_data.json`.
+
+    Returns:
+        tuple[int, int]: Quantidade de tarefas (inseridas, atualizadas).
+    """
+    count_insert = 0
+    count_update = 0
+
+    for rows in _statement_batches(items):
+        if "id_task" in rows[0]:
+            inserted, updated = _execute_update(db, rows)
+        else:
+            inserted, updated = _execute_insert(db, rows), 0
+        count_insert += inserted
+        count_update += updated
+
+    return count_insert, count_update
+
+
+def sync_task_id_sequence(db):
+    """
+    Avança a sequência de `task.id_task` após a inserção de IDs explícitos
+    (ex: a massa inicial do `run_benchmark.py`) acima do último valor gerado,
+    evitando colisões em futuros INSERTs sem ID. O Upsert não precisa dela,
+    pois sempre insere com IDs da sequência.
+    """
+    db.execute(
+        text(
+            """
+            SELECT setval(pg_get_serial_sequence('task', 'id_task'), MAX(id_task))
+            FROM task
+            HAVING MAX(id_task) > COALESCE(
+                pg_sequence_last_value(pg_get_serial_sequence('task', 'id_task')::regclass),
+                0
+            );
+        """
+        )
+    )
+
+
+def delete_tasks_chunk(db, task_ids: list[int]) -> list[int]:
+    """
+    Remove um bloco de tarefas com um único DELETE ... RETURNING.
+
+    Args:
+        db: Sessão do banco de dados (o commit fica a cargo de quem chama).
+        task_ids (list[int]): IDs das tarefas a serem removidas.
+
+    Returns:
+        list[int]: Os IDs efetivamente removidos (IDs inexistentes não aparecem).
+    """
+    result = db.execute(
+        text("DELETE FROM task WHERE id_task = ANY(:ids) RETURNING id_task"),
+        {"ids": list(task_ids)},
+    )
+    return list(result.scalars())
+
+
+def _csv_value(value) -> str:
+    """
+    Converte um valor para o formato CSV do COPY: None vira campo vazio sem
+    aspas (NULL) e textos sempre vão entre aspas, preservando strings vazias.
+    (Função auxiliar interna)
+    """
+    if value is None:
+        return ""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_value(item: dict, column: str):
+    """
+    Retorna o valor de uma coluna do registro para o COPY, já com o status
+    convertido para o código gravado no banco.
+    (Função auxiliar interna)
+    """
+    if column == "status":
+        return status_code(item.get(column))
+    return item.get(column)
+
+
+class _CsvRecordStream:
+    """
+    Objeto file-like que gera, sob demanda, as linhas CSV de um iterável de
+    registros para o `copy_expert` do psycopg2, sem montar o arquivo inteiro
+    em memória.
+    """
+
+    def __init__(self, items):
+        self._lines = (
+            ",".join(_csv_value(_copy_value(item, column)) for column in COPY_COLUMNS)
+            + "\n"
+            for item in items
+        )
+        self._pending = ""
+
+    def read(self, size: int = -1) -> str:
+        pieces = [self._pending]
+        length = len(self._pending)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            pieces.append(line)
+            length += len(line)
+
+        data = "".join(pieces)
+        if size < 0:
+            self._pending = ""
+            return data
+        self._pending = data[size:]
+        return data[:size]
+
+
+def prepare_copy_staging(db, staging_table: str = DEFAULT_STAGING_TABLE):
+    """
+    Cria (se necessário) a tabela temporária de staging usada pelo modo COPY.
+    Tabelas temporárias não geram WAL e são visíveis apenas na conexão que as
+    criou, então cargas simultâneas nunca compartilham a mesma staging. Com
+    ON COMMIT DELETE ROWS, a tabela é esvaziada a cada commit do bloco.
+    """
+    db.execute(
+        text(
+            f"""
+            CREATE TEMP TABLE IF NOT EXISTS {staging_table} (
+                seq BIGSERIAL,
+                id_task INTEGER,
+                description TEXT,
+                status SMALLINT,
+                user_id_fk INTEGER,
+                category_id_fk INTEGER
+            ) ON COMMIT DELETE ROWS;
+        """
+        )
+    )
+
+
+def copy_upsert_tasks_chunk(
+    db, items: list[dict], staging_table: str = DEFAULT_STAGING_TABLE
+) -> tuple[int, int]:
+    """
+    Realiza o Upsert de um bloco de tarefas via COPY.
+
+    Os registros são enviados por `copy_expert` para a tabela temporária de
+    staging da conexão atual e
+    depois mesclados em `task` com um único comando set-based (UPDATE das
+    tarefas existentes e INSERT das novas, aplicando o status padrão de
+    `Task`). No modo COPY, campos ausentes ou nulos mantêm o valor atual.
+    Registros com um ID inexistente viram tarefas novas, com ID da sequência.
+
+    Args:
+        db: Sessão do banco de dados (o commit fica a cargo de quem chama).
+        items (list[dict]): Registros no formato de `upsert_data.json`.
+        staging_table (str): Nome da tabela de staging (ver `prepare_copy_staging`).
+
+    Returns:
+        tuple[int, int]: Quantidade de tarefas (inseridas, atualizadas).
+    """
+    # A staging é criada na mesma conexão (e transação) do COPY, pois a sessão
+    # pode receber outra conexão do pool a cada bloco.
+    prepare_copy_staging(db, staging_table)
+
+    raw_connection = db.connection().connection
+    with raw_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {staging_table} ({', '.join(COPY_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            _CsvRecordStream(items),
+        )
+
+    # Para IDs existentes repetidos no bloco, cada campo recebe o último valor
+    # não nulo, como se os registros fossem aplicados em sequência.
+    merge_query = text(
+        f"""
+        WITH source AS (
+            SELECT
+                id_task,
+                (ARRAY_AGG(description ORDER BY seq DESC)
+                    FILTER (WHERE description IS NOT NULL))[1] AS description,
+                (ARRAY_AGG(status ORDER BY seq DESC)
+                    FILTER (WHERE status IS NOT NULL))[1] AS status,
+                (ARRAY_AGG(user_id_fk ORDER BY seq DESC)
+                    FILTER (WHERE user_id_fk IS NOT NULL))[1] AS user_id_fk,
+                (ARRAY_AGG(category_id_fk ORDER BY seq DESC)
+                    FILTER (WHERE category_id_fk IS NOT NULL))[1] AS category_id_fk
+            FROM {staging_table}
+            WHERE id_task IS NOT NULL
+            GROUP BY id_task
+        ),
+        updated AS (
+            UPDATE task t SET
+                description = COALESCE(s.description, t.description),
+                status = COALESCE(s.status, t.status),
+                user_id_fk = COALESCE(s.user_id_fk, t.user_id_fk),
+                category_id_fk = COALESCE(s.category_id_fk, t.category_id_fk)
+            FROM source s
+            WHERE t.id_task = s.id_task
+            RETURNING t.id_task
+        ),
+        inserted AS (
+            INSERT INTO task (description, status, user_id_fk, category_id_fk)
+            SELECT
+                n.description,
+                COALESCE(n.status, :default_status),
+                n.user_id_fk,
+                n.category_id_fk
+            FROM {staging_table} n
+            WHERE n.id_task IS NULL
+                OR NOT EXISTS (SELECT 1 FROM task t WHERE t.id_task = n.id_task)
+            ORDER BY n.seq
+            RETURNING id_task
+        )
+        SELECT
+            (SELECT COUNT(*) FROM {staging_table}) AS total,
+            (SELECT COUNT(*) FROM inserted) AS inserted;
+    """
+    )
+
+    total, inserted = db.execute(
+        merge_query,
+        {"default_status": status_code(Task.__table__.c.status.default.arg)},
+    ).one()
+    return inserted, total - inserted
+
+
+def _as_int(value) -> int | None:
+    """
+    Converte um ID vindo do JSON (inteiro ou texto numérico, que o PostgreSQL
+    também aceitaria) para int. Retorna None para qualquer outro valor ou
+    para números fora da faixa de INTEGER.
+    (Função auxiliar interna)
+    """
+    if isinstance(value, str) and value.strip().isdecimal():
+        value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool):
+        return None
+    return value if -(2**31) <= value < 2**31 else None
+
+
+def partition_records(records, worker_index: int, workers: int):
+    """
+    Filtra um stream de pares (posição, registro) mantendo apenas os da
+    partição `worker_index`.
+
+    Registros com ID são particionados por `id_task % workers`, de modo que
+    todas as operações sobre uma mesma tarefa caem no mesmo worker e workers
+    distintos nunca disputam as mesmas linhas. Registros sem ID (inserções
+    novas) são distribuídos em rodízio pela posição no arquivo.
+
+    Args:
+        records: Iterável de pares (posição no arquivo, registro).
+        worker_index (int): Índice da partição (0 a workers - 1).
+        workers (int): Quantidade total de partições.
+
+    Yields:
+        tuple[int, dict]: Os pares pertencentes à partição.
+    """
+    for position, item in records:
+        # IDs inválidos caem no rodízio e são rejeitados na validação.
+        task_id = _as_int(item.get("id_task")) if isinstance(item, dict) else None
+        key = task_id or position
+        if key % workers == worker_index:
+            yield position, item
+
+
+def merge_counters(results: list[dict]) -> dict:
+    """
+    Soma os contadores retornados por cada worker (listas são concatenadas).
+    """
+    merged = {}
+    for result in results:
+        for key, value in result.items():
+            if isinstance(value, list):
+                merged.setdefault(key, []).extend(value)
+            else:
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def file_sha256(file_path: str) -> str:
+    """Calcula o hash SHA-256 do conteúdo de um arquivo, lendo-o em blocos."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_checkpoint(db, job_key: str, file_hash: str) -> BatchCheckpoint | None:
+    """
+    Busca o checkpoint de uma carga. Checkpoints de um arquivo com conteúdo
+    diferente (hash divergente) são descartados.
+
+    Returns:
+        BatchCheckpoint or None: O checkpoint válido, ou None para começar do zero.
+    """
+    checkpoint = db.get(BatchCheckpoint, job_key)
+    if checkpoint and checkpoint.file_hash != file_hash:
+        return None
+    return checkpoint
+
+
+def save_checkpoint(
+    db,
+    job_key: str,
+    file_path: str,
+    file_hash: str,
+    record_index: int,
+    completed: bool = False,
+):
+    """
+    Grava o progresso de uma carga. Deve ser chamado na mesma transação do
+    bloco processado, para que checkpoint e dados sejam confirmados juntos.
+    """
+    stmt = insert(BatchCheckpoint).values(
+        job_key=job_key,
+        file_path=file_path,
+        file_hash=file_hash,
+        record_index=record_index,
+        completed=completed,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[BatchCheckpoint.job_key],
+        set_={
+            "file_path": stmt.excluded.file_path,
+            "file_hash": stmt.excluded.file_hash,
+            "record_index": stmt.excluded.record_index,
+            "completed": stmt.excluded.completed,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+def clear_checkpoints(db, job_prefix: str):
+    """Remove os checkpoints de todas as partições de uma carga concluída."""
+    db.query(BatchCheckpoint).filter(
+        BatchCheckpoint.job_key.startswith(job_prefix, autoescape=True)
+    ).delete(synchronize_session=False)
+
+
+def checkpoint_worker_counts(db, job_prefix: str, file_hash: str) -> set[int]:
+    """
+    Retorna as quantidades de workers usadas pelos checkpoints existentes de
+    uma carga (chaves terminadas em "/<workers>"), considerando apenas os do
+    mesmo conteúdo de arquivo.
+    """
+    keys = db.scalars(
+        select(BatchCheckpoint.job_key).where(
+            BatchCheckpoint.job_key.startswith(job_prefix, autoescape=True),
+            BatchCheckpoint.file_hash == file_hash,
+        )
+    )
+    return {int(key.rsplit("/", 1)[1]) for key in keys}
+
+
+def load_fk_ids(db) -> tuple[set[int], set[int]]:
+    """
+    Carrega, uma única vez por carga, os IDs válidos de usuários e categorias
+    para validar as FKs dos registros em memória.
+
+    Returns:
+        tuple[set[int], set[int]]: (IDs de usuários, IDs de categorias).
+    """
+    user_ids = set(db.execute(text('SELECT id_user FROM "user"')).scalars())
+    category_ids = set(db.execute(text("SELECT id_category FROM category")).scalars())
+    return user_ids, category_ids
+
+
+def load_existing_task_ids(db, chunk) -> set[int]:
+    """
+    Busca, com uma única consulta, quais IDs de um bloco já existem em `task`.
+
+    Args:
+        chunk: Lista de pares (posição no arquivo, registro).
+
+    Returns:
+        set[int]: Os IDs do bloco que existem no banco.
+    """
+    task_ids = {
+        _as_int(item.get("id_task")) for _, item in chunk if isinstance(item, dict)
+    }
+    task_ids.discard(None)
+    if not task_ids:
+        return set()
+    result = db.execute(
+        text("SELECT id_task FROM task WHERE id_task = ANY(:ids)"),
+        {"ids": list(task_ids)},
+    )
+    return set(result.scalars())
+
+
+def validate_records(
+    chunk, user_ids: set[int], category_ids: set[int], existing_ids: set[int]
+):
+    """
+    Separa os registros de um bloco em válidos e rejeitados: verifica
+    `user_id_fk` e `category_id_fk` contra os conjuntos carregados por
+    `load_fk_ids`, exige os campos obrigatórios em todo registro que será
+    inserido (sem ID ou com um ID fora de `existing_ids`), não aceita nulos
+    nos campos obrigatórios e rejeita IDs, status e descrições em formato
+    inválido (a descrição precisa ser texto e caber em `task.description`).
+
+    IDs em texto numérico (ex: "1") são convertidos para int nos registros
+    válidos, que são cópias dos originais.
+
+    Args:
+        chunk: Lista de pares (posição no arquivo, registro).
+        user_ids (set[int]): IDs de usuários existentes.
+        category_ids (set[int]): IDs de categorias existentes.
+        existing_ids (set[int]): IDs de tarefas do bloco que já existem
+            (ver `load_existing_task_ids`).
+
+    Returns:
+        tuple[list[dict], list[dict]]: (registros válidos, rejeitados). Cada
+        rejeitado traz "position", "reason" e o "record" original.
+    """
+    valid = []
+    rejected = []
+
+    for position, item in chunk:
+        if not isinstance(item, dict):
+            rejected.append(
+                {"position": position, "reason": "não é um objeto JSON", "record": item}
+            )
+            continue
+
+        reasons = []
+        record = dict(item)
+        for field in ("id_task", "user_id_fk", "category_id_fk"):
+            if item.get(field) is None:
+                continue
+            value = _as_int(item[field])
+            if value is None:
+                reasons.append(f"{field} inválido: {item[field]!r}")
+            else:
+                record[field] = value
+
+        is_update = _as_int(item.get("id_task")) in existing_ids
+        missing = [
+            field
+            for field in REQUIRED_FIELDS
+            if (field in item or not is_update) and item.get(field) is None
+        ]
+        if missing:
+            reasons.append(f"campos obrigatórios ausentes: {', '.join(missing)}")
+        if isinstance(record.get("user_id_fk"), int) and (
+            record["user_id_fk"] not in user_ids
+        ):
+            reasons.append(f"user_id_fk {record['user_id_fk']} não existe")
+        if isinstance(record.get("category_id_fk"), int) and (
+            record["category_id_fk"] not in category_ids
+        ):
+            reasons.append(f"category_id_fk {record['category_id_fk']} não existe")
+        description = item.get("description")
+        if description is not None and not isinstance(description, str):
+            reasons.append(f"description inválida: {description!r}")
+        elif description is not None and len(description) > DESCRIPTION_MAX_LENGTH:
+            reasons.append(
+                f"description com {len(description)} caracteres "
+                f"(máximo {DESCRIPTION_MAX_LENGTH})"
+            )
+        if "status" in item and not (
+            isinstance(item["status"], str) and item["status"] in STATUS_CODES
+        ):
+            reasons.append(f"status {item['status']!r} inválido")
+
+        if reasons:
+            rejected.append(
+                {"position": position, "reason": "; ".join(reasons), "record": item}
+            )
+        else:
+            valid.append(record)
+
+    return valid, rejected
+
+
+def validate_delete_records(chunk):
+    """
+    Extrai os IDs a remover de um bloco do arquivo de deleção. Registros que
+    não são objetos JSON ou sem um `id_task` inteiro (texto numérico, como
+    "5", é aceito) são rejeitados em vez de enviados ao banco.
+
+    Args:
+        chunk: Lista de pares (posição no arquivo, registro).
+
+    Returns:
+        tuple[list[int], list[dict]]: (IDs sem repetição, na ordem do
+        arquivo; rejeitados no mesmo formato de `validate_records`).
+    """
+    task_ids = []
+    rejected = []
+
+    for position, item in chunk:
+        if not isinstance(item, dict):
+            reason = "não é um objeto JSON"
+        elif item.get("id_task") is None:
+            reason = "campos obrigatórios ausentes: id_task"
+        elif _as_int(item["id_task"]) is None:
+            reason = f"id_task inválido: {item['id_task']!r}"
+        else:
+            task_ids.append(_as_int(item["id_task"]))
+            continue
+        rejected.append({"position": position, "reason": reason, "record": item})
+
+    return list(dict.fromkeys(task_ids)), rejected
+
+
+def write_dead_letters(file_path: str, rejected: list[dict], truncate: bool = False):
+    """
+    Grava registros rejeitados em um arquivo JSONL (dead-letter), um por
+    linha. Com `truncate`, o conteúdo anterior do arquivo é descartado.
+    """
+    if not rejected and not (truncate and os.path.exists(file_path)):
+        return
+    with open(file_path, "w" if truncate else "a", encoding="utf-8") as f:
+        for entry in rejected:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
@@ -0,0 +1,81 @@
+import csv
+import gzip
+import json
+from functools import partial
+from src.service.reports_service import (
+    inner_join_report_statement,
+    left_join_report_statement,
+    right_join_report_statement,
+)
+from src.service.scraping_reports_service import (
+    pages_with_articles_statement,
+    pages_with_errors_statement,
+    all_errors_with_pages_statement,
+    articles_by_author_statement,
+)
+
+EXPORT_FORMATS = ("csv", "jsonl")
+# Linhas buscadas do cursor do servidor a cada ida ao banco.
+EXPORT_BATCH_SIZE = 5000
+
+# Relatórios exportáveis: nome -> função que monta a consulta.
+EXPORT_REPORTS = {
+    "tasks-pending": inner_join_report_statement,
+    "tasks-by-category": left_join_report_statement,
+    "users-tasks": right_join_report_statement,
+    "users-tasks-archived": partial(right_join_report_statement, True),
+    "scraping-pages": pages_with_articles_statement,
+    "scraping-page-errors": pages_with_errors_statement,
+    "scraping-errors": all_errors_with_pages_statement,
+    "scraping-authors": articles_by_author_statement,
+}
+
+
+def export_report(
+    db, statement, output_path: str, fmt: str = "csv", batch_size=EXPORT_BATCH_SIZE
+) -> int:
+    """
+    Exporta o resultado de uma consulta para um arquivo gzip (CSV com
+    cabeçalho ou JSONL), lendo as linhas de um cursor nomeado do servidor
+    (`stream_results`). Apenas um lote de `batch_size` linhas fica em
+    memória, independentemente do tamanho do relatório.
+
+    Args:
+        db: Sessão do banco de dados.
+        statement: A consulta (ex: um valor de `EXPORT_REPORTS`).
+        output_path (str): Caminho do arquivo `.gz` gerado.
+        fmt (str): "csv" ou "jsonl".
+        batch_size (int): Linhas buscadas por lote.
+
+    Returns:
+        int: Quantidade de linhas exportadas.
+
+    Raises:
+        ValueError: Se o formato não for suportado.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportação inválido: {fmt}")
+
+    result = db.execute(
+        statement,
+        execution_options={"stream_results": True, "yield_per": batch_size},
+    )
+    columns = list(result.keys())
+    exported = 0
+
+    with gzip.open(output_path, "wt", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for rows in result.partitions(batch_size):
+                writer.writerows(rows)
+                exported += len(rows)
+        else:
+            for rows in result.partitions(batch_size):
+                for row in rows:
+                    record = dict(zip(columns, row))
+                    f.write(json.dumps(record, ensure_ascii=False, default=str))
+                    f.write("\n")
+                exported += len(rows)
+
+    return exported
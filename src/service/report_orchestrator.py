@@ -0,0 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.db_session import DB_POOL_SIZE
+
+
+def run_reports_concurrently(reports, max_workers: int | None = None) -> list:
+    """
+    Executa relatórios independentes ao mesmo tempo, em um pool de threads.
+    Cada função de relatório abre a sua própria sessão, e portanto usa a sua
+    própria conexão do pool. O tempo total fica próximo ao da consulta mais
+    lenta, em vez da soma de todas.
+
+    Args:
+        reports (list): Funções de relatório sem argumentos (use
+            `functools.partial` para fixar opções).
+        max_workers (int): Limite de relatórios simultâneos (padrão: o menor
+            entre a quantidade de relatórios e `DB_POOL_SIZE`).
+
+    Returns:
+        list: Os resultados, na mesma ordem de `reports`.
+    """
+    reports = list(reports)
+    if not reports:
+        return []
+
+    # DB_POOL_SIZE=0 (pool sem limite fixo) não pode zerar o pool de threads.
+    workers = max(1, max_workers or min(len(reports), DB_POOL_SIZE))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(report) for report in reports]
+        return [future.result() for future in futures]
@@ -0,0 +1,96 @@
+import os
+from datetime import timedelta
+from sqlalchemy import text
+from src.utils.report_result import ReportResult
+
+# Materialized views dos relatórios (migração 0007).
+REPORT_VIEWS = (
+    "mv_pages_with_articles",
+    "mv_pages_with_errors",
+    "mv_articles_by_author",
+)
+
+# Defasagem aceita por padrão antes de um relatório atualizar a sua view.
+DEFAULT_MAX_STALENESS = timedelta(
+    seconds=int(os.getenv("REPORT_MAX_STALENESS_SECONDS", "300"))
+)
+
+
+def refresh_report_view(db, view_name: str, concurrently: bool = True):
+    """
+    Recalcula uma materialized view de relatório e registra o horário em
+    `report_refresh`. Com `concurrently`, as leituras da view continuam
+    liberadas durante o refresh.
+
+    Args:
+        db: Sessão do banco de dados (o commit fica a cargo de quem chama).
+        view_name (str): Uma das views de `REPORT_VIEWS`.
+        concurrently (bool): Usa REFRESH MATERIALIZED VIEW CONCURRENTLY.
+
+    Raises:
+        ValueError: Se a view não for uma view de relatório conhecida.
+    """
+    if view_name not in REPORT_VIEWS:
+        raise ValueError(f"View de relatório desconhecida: {view_name}")
+
+    mode = "CONCURRENTLY " if concurrently else ""
+    db.execute(text(f"REFRESH MATERIALIZED VIEW {mode}{view_name};"))
+    db.execute(
+        text(
+            """
+            INSERT INTO report_refresh (view_name, refreshed_at)
+            VALUES (:view_name, now())
+            ON CONFLICT (view_name) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at;
+        """
+        ),
+        {"view_name": view_name},
+    )
+
+
+def get_view_freshness(db, view_name: str):
+    """
+    Returns:
+        tuple: (refreshed_at, defasagem como timedelta), ou (None, None) se a
+        view nunca foi atualizada.
+    """
+    row = db.execute(
+        text(
+            "SELECT refreshed_at, now() - refreshed_at FROM report_refresh "
+            "WHERE view_name = :view_name"
+        ),
+        {"view_name": view_name},
+    ).first()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def read_report_view(
+    db, view_name: str, query, max_staleness: timedelta | None
+) -> ReportResult:
+    """
+    Lê um relatório de sua materialized view. Se os dados estiverem mais
+    defasados que `max_staleness`, a view é atualizada antes da leitura;
+    se outra sessão já estiver atualizando (advisory lock ocupado), usa os
+    dados atuais em vez de esperar. Com `max_staleness=None`, qualquer
+    defasagem é aceita.
+
+    Args:
+        db: Sessão do banco de dados.
+        view_name (str): A view consultada por `query`.
+        query: Consulta SELECT sobre a view.
+        max_staleness (timedelta): Defasagem máxima aceita (opcional).
+
+    Returns:
+        ReportResult: O resultado, com `as_of` igual ao horário do último refresh.
+    """
+    refreshed_at, age = get_view_freshness(db, view_name)
+    if max_staleness is not None and (age is None or age > max_staleness):
+        locked = db.execute(
+            text("SELECT pg_try_advisory_xact_lock(hashtext(:view_name))"),
+            {"view_name": view_name},
+        ).scalar()
+        if locked:
+            refresh_report_view(db, view_name)
+            db.commit()
+            refreshed_at, age = get_view_freshness(db, view_name)
+
+    return ReportResult.from_result(db.execute(query), as_of=refreshed_at)
@@ -1,27 +1,37 @@
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
+from src.model.task_status import TaskStatus, STATUS_PENDING
 from src.utils.db_session import get_db_session
+from src.utils.report_result import ReportResult
 
 
-def get_inner_join_report():
-    """
-    Busca o relatório de tarefas pendentes com seus usuários e categorias.
-    (Etapa 4a: Consulta com INNER JOIN)
-    """
-
-    sql_query = text(
-        """
+def inner_join_report_statement():
+    """Consulta do relatório INNER JOIN (tarefas pendentes)."""
+    return (
+        text(
+            """
         SELECT 
             t.description, t.status, u.name AS user_name, c.category_name
         FROM task t
         INNER JOIN "user" u ON t.user_id_fk = u.id_user
         INNER JOIN category c ON t.category_id_fk = c.id_category
-        WHERE t.status = 'Pendente';
+        WHERE t.status = :pending;
     """
+        )
+        .bindparams(bindparam("pending", STATUS_PENDING, type_=TaskStatus()))
+        .columns(status=TaskStatus())
     )
 
+
+def get_inner_join_report():
+    """
+    Busca o relatório de tarefas pendentes com seus usuários e categorias.
+    (Etapa 4a: Consulta com INNER JOIN)
+    """
+    sql_query = inner_join_report_statement()
+
     db = get_db_session()
     try:
-        return db.execute(sql_query)
+        return ReportResult.from_result(db.execute(sql_query))
     except Exception as e:
         print(f"Erro ao executar INNER JOIN: {e}")
         return None
@@ -29,26 +39,36 @@ def get_inner_join_report():
         db.close()
 
 
-def get_left_join_report():
+def left_join_report_statement():
     """
-    Busca o relatório de todas as categorias e a contagem de tarefas pendentes.
-    (Etapa 4b: Consulta com LEFT JOIN)
+    Consulta do relatório LEFT JOIN. As contagens vêm de `task_counter`
+    (mantida por triggers), então o custo depende da quantidade de
+    categorias, e não da quantidade de tarefas.
     """
-
-    sql_query = text(
+    return text(
         """
         SELECT 
-            c.category_name, COUNT(t.id_task) AS pending_tasks_count
+            c.category_name,
+            COALESCE(SUM(tc.task_count), 0)::BIGINT AS pending_tasks_count
         FROM category c
-        LEFT JOIN task t ON c.id_category = t.category_id_fk AND t.status = 'Pendente'
+        LEFT JOIN task_counter tc
+            ON c.id_category = tc.category_id_fk AND tc.status = :pending
         GROUP BY c.category_name
         ORDER BY c.category_name;
     """
-    )
+    ).bindparams(bindparam("pending", STATUS_PENDING, type_=TaskStatus()))
+
+
+def get_left_join_report():
+    """
+    Busca o relatório de todas as categorias e a contagem de tarefas pendentes.
+    (Etapa 4b: Consulta com LEFT JOIN)
+    """
+    sql_query = left_join_report_statement()
 
     db = get_db_session()
     try:
-        return db.execute(sql_query)
+        return ReportResult.from_result(db.execute(sql_query))
     except Exception as e:
         print(f"Erro ao executar LEFT JOIN: {e}")
         return None
@@ -56,24 +76,43 @@ def get_left_join_report():
         db.close()
 
 
-def get_right_join_report():
+def right_join_report_statement(include_archived: bool = False):
     """
-    Busca o relatório de todos os usuários e suas tarefas (se existirem).
-    (Etapa 4c: Consulta com RIGHT JOIN)
+    Consulta do relatório RIGHT JOIN (usuários e suas tarefas).
+
+    Args:
+        include_archived (bool): Se True, inclui as tarefas de `task_archive`.
     """
-    sql_query = text(
-        """
+    tasks_source = (
+        "(SELECT user_id_fk, description FROM task "
+        "UNION ALL SELECT user_id_fk, description FROM task_archive)"
+        if include_archived
+        else "task"
+    )
+    return text(
+        f"""
         SELECT 
             u.name AS user_name, t.description AS task_description
-        FROM task t
+        FROM {tasks_source} t
         RIGHT JOIN "user" u ON t.user_id_fk = u.id_user
         ORDER BY u.name;
     """
     )
 
+
+def get_right_join_report(include_archived: bool = False):
+    """
+    Busca o relatório de todos os usuários e suas tarefas (se existirem).
+    (Etapa 4c: Consulta com RIGHT JOIN)
+
+    Args:
+        include_archived (bool): Se True, inclui as tarefas de `task_archive`.
+    """
+    sql_query = right_join_report_statement(include_archived)
+
     db = get_db_session()
     try:
-        return db.execute(sql_query)
+        return ReportResult.from_result(db.execute(sql_query))
     except Exception as e:
         print(f"Erro ao executar RIGHT JOIN: {e}")
         return None
@@ -1,41 +1,143 @@
-from sqlalchemy import text, func
+from datetime import timedelta
+from sqlalchemy import text
 from src.utils.db_session import get_db_session
-from src.model.scraping_models import ScrapedPage, ScrapedArticle, ScrapingError
+from src.utils.report_result import ReportResult
+from src.service.report_views_service import DEFAULT_MAX_STALENESS, read_report_view
+
+
+def pages_with_articles_statement():
+    """Consulta do relatório INNER JOIN de páginas com artigos, direto nas tabelas."""
+    return text(
+        """
+        SELECT 
+            sp.id_page,
+            sp.url,
+            sp.title AS page_title,
+            sp.scraping_date,
+            COUNT(sa.id_article) AS articles_count
+        FROM scraped_page sp
+        INNER JOIN scraped_article sa ON sp.id_page = sa.page_id_fk
+        GROUP BY sp.id_page, sp.url, sp.title, sp.scraping_date
+        ORDER BY articles_count DESC;
+    """
+    )
+
+
+def pages_with_errors_statement():
+    """Consulta do relatório LEFT JOIN de páginas e erros, direto nas tabelas."""
+    return text(
+        """
+        SELECT 
+            sp.url,
+            sp.title,
+            sp.status_code,
+            COUNT(se.id_error) AS error_count,
+            STRING_AGG(DISTINCT se.error_type, ', ') AS error_types
+        FROM scraped_page sp
+        LEFT JOIN scraping_error se ON sp.id_page = se.page_id_fk
+        GROUP BY sp.id_page, sp.url, sp.title, sp.status_code
+        ORDER BY error_count DESC;
+    """
+    )
+
+
+def all_errors_with_pages_statement():
+    """Consulta do histórico de erros com as suas páginas."""
+    return text(
+        """
+        SELECT 
+            se.id_error,
+            se.url_attempted,
+            se.error_type,
+            se.error_message,
+            se.occurred_at,
+            sp.url AS page_url,
+            sp.title AS page_title
+        FROM scraping_error se
+        LEFT JOIN scraped_page sp ON se.page_id_fk = sp.id_page
+        ORDER BY se.occurred_at DESC;
+    """
+    )
+
+
+def articles_by_author_statement():
+    """Consulta do relatório de artigos por autor (top 20), direto nas tabelas."""
+    return text(
+        """
+        SELECT 
+            sa.author,
+            COUNT(sa.id_article) AS article_count,
+            STRING_AGG(DISTINCT sp.url, ' | ') AS sources
+        FROM scraped_article sa
+        INNER JOIN scraped_page sp ON sa.page_id_fk = sp.id_page
+        WHERE sa.author != 'Unknown'
+        GROUP BY sa.author
+        HAVING COUNT(sa.id_article) > 0
+        ORDER BY article_count DESC
+        LIMIT 20;
+    """
+    )
 
 
 class ScrapingReportsService:
     """
     Gera relatórios e estatísticas sobre os dados coletados via scraping.
     Utiliza consultas SQL com operações de JOIN e agregações.
+
+    Os relatórios agregados leem, por padrão, das materialized views da
+    migração 0007. Com `fresh=True` a consulta roda direto nas tabelas; caso
+    contrário, a view é atualizada antes da leitura se estiver mais defasada
+    que `max_staleness` (None aceita qualquer defasagem).
     """
 
     @staticmethod
-    def get_pages_with_articles():
+    def _read_view(view_name: str, sql: str, max_staleness, error_label: str):
+        """
+        Lê um relatório de sua materialized view, atualizando-a se necessário.
+        (Função auxiliar interna)
+        """
+        db = get_db_session()
+        try:
+            return read_report_view(db, view_name, text(sql), max_staleness)
+        except Exception as e:
+            db.rollback()
+            print(f"{error_label}: {e}")
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_pages_with_articles(
+        fresh: bool = False, max_staleness: timedelta | None = DEFAULT_MAX_STALENESS
+    ):
         """
         Relatório com INNER JOIN: Retorna páginas que possuem artigos extraídos.
         Agrupa por página e conta o número de artigos.
 
+        Args:
+            fresh (bool): Se True, consulta as tabelas em vez da materialized view.
+            max_staleness (timedelta): Defasagem máxima aceita da view.
+
         Returns:
-            Result: Objeto Result do SQLAlchemy ou None em caso de erro.
-        """
-        query = text(
-            """
-            SELECT 
-                sp.id_page,
-                sp.url,
-                sp.title AS page_title,
-                sp.scraping_date,
-                COUNT(sa.id_article) AS articles_count
-            FROM scraped_page sp
-            INNER JOIN scraped_article sa ON sp.id_page = sa.page_id_fk
-            GROUP BY sp.id_page, sp.url, sp.title, sp.scraping_date
-            ORDER BY articles_count DESC;
+            ReportResult: Resultado materializado ou None em caso de erro.
         """
-        )
+        if not fresh:
+            return ScrapingReportsService._read_view(
+                "mv_pages_with_articles",
+                """
+                SELECT id_page, url, page_title, scraping_date, articles_count
+                FROM mv_pages_with_articles
+                ORDER BY articles_count DESC;
+                """,
+                max_staleness,
+                "Erro no relatório INNER JOIN",
+            )
+
+        query = pages_with_articles_statement()
 
         db = get_db_session()
         try:
-            return db.execute(query)
+            return ReportResult.from_result(db.execute(query))
         except Exception as e:
             print(f"Erro no relatório INNER JOIN: {e}")
             return None
@@ -43,32 +145,37 @@ class ScrapingReportsService:
             db.close()
 
     @staticmethod
-    def get_pages_with_errors():
+    def get_pages_with_errors(
+        fresh: bool = False, max_staleness: timedelta | None = DEFAULT_MAX_STALENESS
+    ):
         """
         Relatório com LEFT JOIN: Retorna todas as páginas e seus erros (se houver).
         Páginas sem erros também são incluídas com contagem 0.
 
+        Args:
+            fresh (bool): Se True, consulta as tabelas em vez da materialized view.
+            max_staleness (timedelta): Defasagem máxima aceita da view.
+
         Returns:
-            Result: Objeto Result do SQLAlchemy ou None em caso de erro.
+            ReportResult: Resultado materializado ou None em caso de erro.
         """
-        query = text(
-            """
-            SELECT 
-                sp.url,
-                sp.title,
-                sp.status_code,
-                COUNT(se.id_error) AS error_count,
-                STRING_AGG(DISTINCT se.error_type, ', ') AS error_types
-            FROM scraped_page sp
-            LEFT JOIN scraping_error se ON sp.id_page = se.page_id_fk
-            GROUP BY sp.id_page, sp.url, sp.title, sp.status_code
-            ORDER BY error_count DESC;
-        """
-        )
+        if not fresh:
+            return ScrapingReportsService._read_view(
+                "mv_pages_with_errors",
+                """
+                SELECT url, title, status_code, error_count, error_types
+                FROM mv_pages_with_errors
+                ORDER BY error_count DESC;
+                """,
+                max_staleness,
+                "Erro no relatório LEFT JOIN",
+            )
+
+        query = pages_with_errors_statement()
 
         db = get_db_session()
         try:
-            return db.execute(query)
+            return ReportResult.from_result(db.execute(query))
         except Exception as e:
             print(f"Erro no relatório LEFT JOIN: {e}")
             return None
@@ -82,27 +189,13 @@ class ScrapingReportsService:
         Erros sem página associada também são incluídos.
 
         Returns:
-            Result: Objeto Result do SQLAlchemy ou None em caso de erro.
-        """
-        query = text(
-            """
-            SELECT 
-                se.id_error,
-                se.url_attempted,
-                se.error_type,
-                se.error_message,
-                se.occurred_at,
-                sp.url AS page_url,
-                sp.title AS page_title
-            FROM scraping_error se
-            LEFT JOIN scraped_page sp ON se.page_id_fk = sp.id_page
-            ORDER BY se.occurred_at DESC;
+            ReportResult: Resultado materializado ou None em caso de erro.
         """
-        )
+        query = all_errors_with_pages_statement()
 
         db = get_db_session()
         try:
-            return db.execute(query)
+            return ReportResult.from_result(db.execute(query))
         except Exception as e:
             print(f"Erro no relatório de erros: {e}")
             return None
@@ -110,35 +203,52 @@ class ScrapingReportsService:
             db.close()
 
     @staticmethod
-    def get_summary_statistics():
+    def get_summary_statistics(fast: bool = False):
         """
-        Calcula estatísticas gerais do scraping.
+        Calcula estatísticas gerais do scraping, em uma única consulta.
+
+        Args:
+            fast (bool): Se True, lê os totais de `scraping_stats` (mantidos por
+                triggers a cada inserção) em vez de contar as tabelas.
 
         Returns:
             dict: Dicionário com total_pages, total_articles, total_errors e avg_articles_per_page.
                   Retorna None em caso de erro.
         """
+        source = (
+            "(SELECT total_pages, total_articles, total_errors "
+            "FROM scraping_stats WHERE id = 1)"
+            if fast
+            else """(
+                SELECT
+                    (SELECT COUNT(*) FROM scraped_page) AS total_pages,
+                    (SELECT COUNT(*) FROM scraped_article) AS total_articles,
+                    (SELECT COUNT(*) FROM scraping_error) AS total_errors
+            )"""
+        )
+        # Todo artigo pertence a uma página, então a média de artigos por
+        # página é o total de artigos dividido pelo total de páginas.
+        query = text(
+            f"""
+            SELECT
+                total_pages,
+                total_articles,
+                total_errors,
+                total_articles::FLOAT / NULLIF(total_pages, 0) AS avg_articles_per_page
+            FROM {source} s;
+        """
+        )
+
         db = get_db_session()
         try:
-            total_pages = db.query(func.count(ScrapedPage.id_page)).scalar()
-            total_articles = db.query(func.count(ScrapedArticle.id_article)).scalar()
-            total_errors = db.query(func.count(ScrapingError.id_error)).scalar()
-
-            # Calcula média de artigos por página
-            avg_articles_per_page = db.query(
-                func.avg(
-                    db.query(func.count(ScrapedArticle.id_article))
-                    .filter(ScrapedArticle.page_id_fk == ScrapedPage.id_page)
-                    .correlate(ScrapedPage)
-                    .scalar_subquery()
-                )
-            ).scalar()
-
+            row = db.execute(query).mappings().first()
+            if row is None:
+                row = {}
             return {
-                "total_pages": total_pages or 0,
-                "total_articles": total_articles or 0,
-                "total_errors": total_errors or 0,
-                "avg_articles_per_page": float(avg_articles_per_page or 0),
+                "total_pages": row.get("total_pages") or 0,
+                "total_articles": row.get("total_articles") or 0,
+                "total_errors": row.get("total_errors") or 0,
+                "avg_articles_per_page": float(row.get("avg_articles_per_page") or 0),
             }
         except Exception as e:
             print(f"Erro nas estatísticas: {e}")
@@ -147,33 +257,38 @@ class ScrapingReportsService:
             db.close()
 
     @staticmethod
-    def get_articles_by_author():
+    def get_articles_by_author(
+        fresh: bool = False, max_staleness: timedelta | None = DEFAULT_MAX_STALENESS
+    ):
         """
         Relatório: Agrupa artigos por autor e conta quantos artigos cada um escreveu.
         Exclui autores "Unknown" e limita aos top 20.
 
+        Args:
+            fresh (bool): Se True, consulta as tabelas em vez da materialized view.
+            max_staleness (timedelta): Defasagem máxima aceita da view.
+
         Returns:
-            Result: Objeto Result do SQLAlchemy ou None em caso de erro.
-        """
-        query = text(
-            """
-            SELECT 
-                sa.author,
-                COUNT(sa.id_article) AS article_count,
-                STRING_AGG(DISTINCT sp.url, ' | ') AS sources
-            FROM scraped_article sa
-            INNER JOIN scraped_page sp ON sa.page_id_fk = sp.id_page
-            WHERE sa.author != 'Unknown'
-            GROUP BY sa.author
-            HAVING COUNT(sa.id_article) > 0
-            ORDER BY article_count DESC
-            LIMIT 20;
+            ReportResult: Resultado materializado ou None em caso de erro.
         """
-        )
+        if not fresh:
+            return ScrapingReportsService._read_view(
+                "mv_articles_by_author",
+                """
+                SELECT author, article_count, sources
+                FROM mv_articles_by_author
+                ORDER BY article_count DESC
+                LIMIT 20;
+                """,
+                max_staleness,
+                "Erro no relatório por autor",
+            )
+
+        query = articles_by_author_statement()
 
         db = get_db_session()
         try:
-            return db.execute(query)
+            return ReportResult.from_result(db.execute(query))
         except Exception as e:
             print(f"Erro no relatório por autor: {e}")
             return None
@@ -0,0 +1,71 @@
+from sqlalchemy import text
+
+# Consulta com a contagem real de cada tabela, na ordem das colunas de scraping_stats.
+_ACTUAL_COUNTS = """
+    (SELECT COUNT(*) FROM scraped_page),
+    (SELECT COUNT(*) FROM scraped_article),
+    (SELECT COUNT(*) FROM scraping_error)
+"""
+
+
+def reconcile_scraping_stats(db) -> tuple:
+    """
+    Recalcula `scraping_stats` a partir das tabelas de scraping, corrigindo
+    qualquer divergência (ex: triggers desativadas durante uma manutenção).
+
+    As escritas nas tabelas de scraping ficam bloqueadas até o commit (LOCK
+    SHARE ROW EXCLUSIVE); as leituras continuam liberadas.
+
+    Args:
+        db: Sessão do banco de dados (o commit fica a cargo de quem chama).
+
+    Returns:
+        tuple: Os novos totais (páginas, artigos, erros).
+    """
+    db.execute(
+        text(
+            "LOCK TABLE scraped_page, scraped_article, scraping_error "
+            "IN SHARE ROW EXCLUSIVE MODE;"
+        )
+    )
+    return db.execute(
+        text(
+            f"""
+            INSERT INTO scraping_stats (id, total_pages, total_articles, total_errors)
+            SELECT 1, {_ACTUAL_COUNTS}
+            ON CONFLICT (id) DO UPDATE SET
+                total_pages = EXCLUDED.total_pages,
+                total_articles = EXCLUDED.total_articles,
+                total_errors = EXCLUDED.total_errors
+            RETURNING total_pages, total_articles, total_errors;
+        """
+        )
+    ).one()
+
+
+def find_scraping_stats_drift(db) -> list:
+    """
+    Compara `scraping_stats` com uma contagem completa das tabelas de scraping.
+
+    Returns:
+        list: Tuplas (nome do total, contador, real) que divergem.
+    """
+    row = db.execute(
+        text(
+            f"""
+            SELECT
+                COALESCE(s.total_pages, 0),
+                COALESCE(s.total_articles, 0),
+                COALESCE(s.total_errors, 0),
+                {_ACTUAL_COUNTS}
+            FROM (SELECT 1) one
+            LEFT JOIN scraping_stats s ON s.id = 1;
+        """
+        )
+    ).one()
+    names = ("total_pages", "total_articles", "total_errors")
+    return [
+        (name, counter, actual)
+        for name, counter, actual in zip(names, row[:3], row[3:])
+        if counter != actual
+    ]
@@ -0,0 +1,61 @@
+from sqlalchemy import text
+from src.model.task_status import TaskStatus
+
+
+def reconcile_task_counters(db) -> int:
+    """
+    Recalcula `task_counter` do zero a partir de `task`, corrigindo qualquer
+    divergência (ex: triggers desativadas durante uma manutenção).
+
+    As escritas em `task` ficam bloqueadas até o commit (LOCK SHARE ROW
+    EXCLUSIVE), para que nenhuma alteração escape da recontagem; as leituras
+    continuam liberadas.
+
+    Args:
+        db: Sessão do banco de dados (o commit fica a cargo de quem chama).
+
+    Returns:
+        int: A quantidade de linhas de contador geradas.
+    """
+    db.execute(text("LOCK TABLE task IN SHARE ROW EXCLUSIVE MODE;"))
+    db.execute(text("DELETE FROM task_counter;"))
+    result = db.execute(
+        text(
+            """
+            INSERT INTO task_counter (user_id_fk, category_id_fk, status, task_count)
+            SELECT user_id_fk, category_id_fk, status, COUNT(*)
+            FROM task
+            GROUP BY 1, 2, 3;
+        """
+        )
+    )
+    return result.rowcount
+
+
+def find_counter_drift(db) -> list:
+    """
+    Compara `task_counter` com uma contagem completa de `task`.
+
+    Returns:
+        list: Linhas (user_id_fk, category_id_fk, status, contador, real) que divergem.
+    """
+    result = db.execute(
+        text(
+            """
+            SELECT
+                COALESCE(c.user_id_fk, t.user_id_fk) AS user_id_fk,
+                COALESCE(c.category_id_fk, t.category_id_fk) AS category_id_fk,
+                COALESCE(c.status, t.status) AS status,
+                COALESCE(c.task_count, 0) AS counter_count,
+                COALESCE(t.task_count, 0) AS actual_count
+            FROM task_counter c
+            FULL JOIN (
+                SELECT user_id_fk, category_id_fk, status, COUNT(*) AS task_count
+                FROM task
+                GROUP BY 1, 2, 3
+            ) t USING (user_id_fk, category_id_fk, status)
+            WHERE COALESCE(c.task_count, 0) <> COALESCE(t.task_count, 0);
+        """
+        ).columns(status=TaskStatus())
+    )
+    return result.all()
@@ -1,20 +1,252 @@
-from src.model.task import Task
+from contextlib import contextmanager
+from sqlalchemy import REAL, and_, cast, delete, func, insert, or_, select, update
+from sqlalchemy.orm import joinedload
+from src.model.task import Task, SEARCH_CONFIG
+from src.model.task_archive import TaskArchive
+from src.model.task_status import STATUS_PENDING, STATUS_COMPLETED
+from src.model.user import User
+from src.model.category import Category
+from src.model.task_snapshot import TaskSnapshot
 from src.utils.db_session import get_db_session
+from src.utils.cache import get_task_cache, invalidate_tasks_on_commit
+from src.service.batch_service import iter_chunks, delete_tasks_chunk
+
+DEFAULT_PAGE_SIZE = 500
+BULK_CHUNK_SIZE = 1000
+DEFAULT_SEARCH_LIMIT = 20
+
+
+# Construtores de comandos compartilhados entre TaskService e AsyncTaskService.
+
+
+def insert_task_statement(description: str, user_id: int, category_id: int):
+    """INSERT ... RETURNING de uma tarefa (retorna o objeto Task completo)."""
+    return (
+        insert(Task)
+        .values(
+            description=description,
+            user_id_fk=user_id,
+            category_id_fk=category_id,
+        )
+        .returning(Task)
+    )
+
+
+def insert_tasks_statement(tasks: list[tuple[str, int, int]]):
+    """INSERT de múltiplas linhas ... RETURNING id_task de um bloco de tarefas."""
+    table = Task.__table__
+    return (
+        insert(table)
+        .values(
+            [
+                {
+                    "description": description,
+                    "user_id_fk": user_id,
+                    "category_id_fk": category_id,
+                }
+                for description, user_id, category_id in tasks
+            ]
+        )
+        .returning(table.c.id_task)
+    )
+
+
+def task_list_statement(pending_only: bool = False):
+    """
+    SELECT de tarefas com usuário e categoria carregados na mesma consulta
+    (joinedload), para que `task.user` e `task.category` fiquem disponíveis
+    mesmo após a sessão ser fechada, sem uma consulta extra por linha.
+    """
+    stmt = select(Task).options(joinedload(Task.user), joinedload(Task.category))
+    if pending_only:
+        stmt = stmt.where(Task.status == STATUS_PENDING)
+    return stmt
+
+
+def _keyset_page(stmt, last_id: int | None, page_size: int):
+    """Restringe um SELECT de tarefas à página seguinte a `last_id` (keyset)."""
+    if last_id is not None:
+        stmt = stmt.where(Task.id_task > last_id)
+    return stmt.order_by(Task.id_task).limit(page_size)
+
+
+def task_page_statement(pending_only: bool, last_id: int | None, page_size: int):
+    """SELECT de uma página de tarefas com `id_task > last_id` (keyset)."""
+    return _keyset_page(task_list_statement(pending_only), last_id, page_size)
+
+
+def task_snapshot_page_statement(
+    pending_only: bool, last_id: int | None, page_size: int
+):
+    """
+    SELECT de uma página de tarefas projetando apenas as colunas de
+    `TaskSnapshot` (com nome do usuário e da categoria via JOIN), sem montar
+    objetos ORM.
+    """
+    stmt = _task_snapshot_select()
+    if pending_only:
+        stmt = stmt.where(Task.status == STATUS_PENDING)
+    return _keyset_page(stmt, last_id, page_size)
+
+
+def _task_snapshot_select(*extra_columns):
+    """SELECT das colunas de `TaskSnapshot` (e de `extra_columns`, ao final)."""
+    return (
+        select(
+            Task.id_task,
+            Task.description,
+            Task.status,
+            Task.creation_date,
+            Task.user_id_fk,
+            Task.category_id_fk,
+            User.name,
+            Category.category_name,
+            *extra_columns,
+        )
+        .join(Task.user)
+        .join(Task.category)
+    )
+
+
+def encode_search_cursor(rank: float, task_id: int) -> str:
+    """Monta o cursor da próxima página de `search_tasks` (relevância:ID)."""
+    return f"{rank!r}:{task_id}"
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    """
+    Lê um cursor gerado por `encode_search_cursor`.
+
+    Raises:
+        ValueError: Se o cursor for inválido.
+    """
+    try:
+        rank, task_id = cursor.split(":")
+        return float(rank), int(task_id)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Cursor de busca inválido: {cursor!r}") from None
+
+
+def task_search_statement(query: str, limit: int, cursor: str | None = None):
+    """
+    SELECT das tarefas cuja descrição casa com `query` (sintaxe de busca web:
+    palavras, "frases", -exclusão, OR), usando o índice GIN de
+    `description_tsv`. Ordena por relevância (ts_rank) e depois por ID, com
+    paginação por chave a partir do `cursor`.
+    """
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    rank = func.ts_rank(Task.description_tsv, ts_query).label("rank")
+    stmt = _task_snapshot_select(rank).where(
+        Task.description_tsv.bool_op("@@")(ts_query)
+    )
+    if cursor is not None:
+        last_rank, last_id = decode_search_cursor(cursor)
+        # ts_rank retorna REAL: compara no mesmo tipo para o empate ser exato.
+        last_rank = cast(last_rank, REAL)
+        stmt = stmt.where(
+            or_(rank < last_rank, and_(rank == last_rank, Task.id_task > last_id))
+        )
+    return stmt.order_by(rank.desc(), Task.id_task).limit(limit)
+
+
+def search_page(rows, limit: int) -> tuple[list[TaskSnapshot], str | None]:
+    """
+    Converte as linhas de `task_search_statement` em snapshots e calcula o
+    cursor da próxima página (None se esta for a última).
+    """
+    rows = list(rows)
+    tasks = [TaskSnapshot(*row[:-1]) for row in rows]
+    if len(rows) < limit:
+        return tasks, None
+    return tasks, encode_search_cursor(rows[-1].rank, rows[-1].id_task)
+
+
+def complete_task_statement(task_id: int):
+    """UPDATE ... RETURNING que marca uma tarefa como 'Concluída'."""
+    return (
+        update(Task)
+        .where(Task.id_task == task_id)
+        .values(status=STATUS_COMPLETED)
+        .returning(Task.id_task)
+    )
+
+
+def complete_tasks_statement(task_ids: list[int]):
+    """UPDATE ... RETURNING que marca um bloco de tarefas como 'Concluída'."""
+    table = Task.__table__
+    return (
+        update(table)
+        .where(table.c.id_task.in_(task_ids))
+        .values(status=STATUS_COMPLETED)
+        .returning(table.c.id_task)
+    )
+
+
+def delete_task_statement(task_id: int):
+    """DELETE ... RETURNING de uma tarefa."""
+    return delete(Task).where(Task.id_task == task_id).returning(Task.id_task)
+
+
+def delete_tasks_statement(task_ids: list[int]):
+    """DELETE ... RETURNING de um bloco de tarefas."""
+    table = Task.__table__
+    return delete(table).where(table.c.id_task.in_(task_ids)).returning(table.c.id_task)
 
 
 class TaskService:
     """
     Gerencia a lógica de negócio para uma coleção de tarefas.
     Esta versão se conecta a um banco de dados PostgreSQL via SQLAlchemy.
+
+    Por padrão, cada método abre, confirma e fecha a sua própria sessão. Se
+    uma sessão for informada (ex: de `session_scope()`), todos os métodos a
+    reutilizam: as alterações são apenas enviadas (flush) e o commit ou
+    rollback fica a cargo da unidade de trabalho, e erros são propagados.
     """
 
-    def __init__(self):
-        """Inicializa o serviço de tarefas."""
-        pass
+    def __init__(self, session=None):
+        """
+        Inicializa o serviço de tarefas.
+
+        Args:
+            session: Sessão compartilhada de uma unidade de trabalho (opcional).
+        """
+        self.session = session
+
+    @contextmanager
+    def _session(self):
+        """
+        Fornece a sessão da unidade de trabalho ou uma sessão própria,
+        fechada ao final.
+        (Função auxiliar interna)
+        """
+        if self.session is not None:
+            yield self.session
+            return
+
+        db = get_db_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def _commit(self, db_session, task_ids):
+        """
+        Confirma a sessão própria ou apenas faz flush na unidade de trabalho.
+        As tarefas alteradas saem do cache logo após o commit, seja ele feito
+        aqui ou, na unidade de trabalho, por quem a controla.
+        (Função auxiliar interna)
+        """
+        invalidate_tasks_on_commit(db_session, task_ids)
+        if self.session is None:
+            db_session.commit()
+        else:
+            db_session.flush()
 
     def add_task(self, description: str, user_id: int, category_id: int) -> Task | None:
         """
-        Cria e adiciona uma nova tarefa ao BANCO DE DADOS.
+        Cria e adiciona uma nova tarefa ao BANCO DE DADOS, com um único
+        INSERT ... RETURNING (sem o `refresh` após o commit).
 
         Args:
             description (str): A descrição da tarefa.
@@ -24,113 +256,314 @@ class TaskService:
         Returns:
             Task: O objeto da tarefa que foi criada, ou None se falhar.
         """
-        db = get_db_session()
-        try:
-            new_task = Task(
-                description=description,
-                user_id_fk=user_id,
-                category_id_fk=category_id,
-            )
-            db.add(new_task)
-            db.commit()
-            db.refresh(new_task)
-            return new_task
-        except Exception as e:
-            db.rollback()
-            print(f"Erro ao adicionar tarefa: {e}")
-            return None
-        finally:
-            db.close()
+        with self._session() as db:
+            try:
+                stmt = insert_task_statement(description, user_id, category_id)
+                new_task = db.execute(stmt).scalar_one()
+                if self.session is None:
+                    # Já veio completa do RETURNING: desanexa para o commit não expirá-la.
+                    db.expunge(new_task)
+                self._commit(db, [new_task.id_task])
+                return new_task
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                db.rollback()
+                print(f"Erro ao adicionar tarefa: {e}")
+                return None
 
     def list_all_tasks(self) -> list[Task]:
         """
         Retorna uma lista de TODAS as tarefas do banco de dados.
 
         Returns:
-            list[Task]: Uma lista de objetos Task.
+            list[Task]: Uma lista de objetos Task (com usuário e categoria já carregados).
         """
-        db = get_db_session()
-        try:
-            tasks = db.query(Task).all()
+        with self._session() as db:
+            tasks = db.scalars(task_list_statement()).all()
             return tasks
-        finally:
-            db.close()
 
     def list_pending_tasks(self) -> list[Task]:
         """
         Retorna uma lista de todas as tarefas com o status 'Pendente'.
         """
-        db = get_db_session()
-        try:
-
-            tasks = db.query(Task).filter(Task.status == "Pendente").all()
+        with self._session() as db:
+            tasks = db.scalars(task_list_statement(pending_only=True)).all()
             return tasks
-        finally:
-            db.close()
+
+    def _iter_task_pages(
+        self, pending_only: bool, page_size: int, snapshots: bool = False
+    ):
+        """
+        Percorre as tarefas em páginas ordenadas por `id_task`, usando paginação
+        por chave (keyset): cada página busca `id_task > último ID visto`, sem
+        OFFSET, e a sessão de leitura só fica aberta durante a busca da página.
+        Com `snapshots`, cada página é montada como `TaskSnapshot`.
+        (Função auxiliar interna)
+        """
+        last_id = None
+        while True:
+            with self._session() as db:
+                if snapshots:
+                    stmt = task_snapshot_page_statement(
+                        pending_only, last_id, page_size
+                    )
+                    page = [TaskSnapshot(*row) for row in db.execute(stmt)]
+                else:
+                    stmt = task_page_statement(pending_only, last_id, page_size)
+                    page = db.scalars(stmt).all()
+
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            last_id = page[-1].id_task
+
+    def iter_all_tasks(self, page_size: int = DEFAULT_PAGE_SIZE):
+        """
+        Versão iterável de `list_all_tasks`: retorna as tarefas página por
+        página, sem carregar a tabela inteira em memória.
+
+        Args:
+            page_size (int): Quantidade de tarefas por página.
+
+        Yields:
+            list[Task]: A próxima página de tarefas, em ordem de ID.
+        """
+        return self._iter_task_pages(False, page_size)
+
+    def iter_pending_tasks(self, page_size: int = DEFAULT_PAGE_SIZE):
+        """
+        Versão iterável de `list_pending_tasks`: retorna as tarefas pendentes
+        página por página, sem carregar todas em memória.
+
+        Args:
+            page_size (int): Quantidade de tarefas por página.
+
+        Yields:
+            list[Task]: A próxima página de tarefas pendentes, em ordem de ID.
+        """
+        return self._iter_task_pages(True, page_size)
+
+    def iter_task_snapshots(
+        self, pending_only: bool = False, page_size: int = DEFAULT_PAGE_SIZE
+    ):
+        """
+        Versão leve das listagens: retorna páginas de `TaskSnapshot` (tuplas
+        imutáveis com os dados da tarefa e os nomes do usuário e da categoria),
+        lidas com uma única consulta por página e sem objetos ORM.
+
+        Args:
+            pending_only (bool): Se True, retorna apenas as tarefas pendentes.
+            page_size (int): Quantidade de tarefas por página.
+
+        Yields:
+            list[TaskSnapshot]: A próxima página de tarefas, em ordem de ID.
+        """
+        return self._iter_task_pages(pending_only, page_size, snapshots=True)
+
+    def search_tasks(
+        self, query: str, limit: int = DEFAULT_SEARCH_LIMIT, cursor: str | None = None
+    ) -> tuple[list[TaskSnapshot], str | None]:
+        """
+        Busca tarefas pela descrição (busca textual com índice GIN), das mais
+        relevantes para as menos relevantes.
+
+        Args:
+            query (str): Termos de busca (ex: 'relatório -rascunho', '"ir ao mercado"').
+            limit (int): Quantidade máxima de tarefas por página.
+            cursor (str): Cursor retornado pela página anterior (opcional).
+
+        Returns:
+            tuple[list[TaskSnapshot], str | None]: As tarefas da página e o cursor
+            da próxima página (None se não houver mais resultados).
+        """
+        with self._session() as db:
+            try:
+                stmt = task_search_statement(query, limit, cursor)
+                return search_page(db.execute(stmt), limit)
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                print(f"Erro ao buscar tarefas: {e}")
+                return [], None
 
     def _find_task_by_id(self, db_session, task_id: int) -> Task | None:
         """
         Encontra uma tarefa na sessão do banco pelo seu ID.
         (Função auxiliar interna)
         """
-        return db_session.query(Task).filter(Task.id_task == task_id).first()
+        return db_session.get(Task, task_id)
 
-    def get_task_by_id(self, task_id: int) -> Task | None:
+    def get_task_by_id(
+        self, task_id: int, include_archived: bool = False
+    ) -> Task | TaskSnapshot | None:
         """
         Busca e retorna uma única tarefa pelo seu ID.
 
+        Com o cache de tarefas ativo (TASK_CACHE_SIZE > 0), a leitura passa pelo
+        cache e retorna um `TaskSnapshot` imutável; dentro de uma unidade de
+        trabalho o cache não é usado, pois a sessão pode ter alterações ainda
+        não confirmadas. Com `include_archived`, uma tarefa que não está em
+        `task` é procurada em `task_archive` e retornada como `TaskSnapshot` com `archived=True`.
+
         Args:
             task_id (int): O ID da tarefa a ser encontrada.
+            include_archived (bool): Se True, procura também nas tarefas arquivadas.
 
         Returns:
-            Task or None: O objeto da tarefa se encontrado, caso contrário None.
+            Task, TaskSnapshot or None: A tarefa se encontrada, caso contrário None.
         """
-        db = get_db_session()
-        try:
-            task = self._find_task_by_id(db, task_id)
-            return task
-        except Exception as e:
-            print(f"Erro ao buscar tarefa: {e}")
-            return None
-        finally:
-            db.close()
+        cache = get_task_cache() if self.session is None else None
+        if cache is not None:
+            snapshot = cache.get(task_id)
+            if snapshot is not None:
+                return snapshot
+
+        with self._session() as db:
+            try:
+                task = self._find_task_by_id(db, task_id)
+                if task is None and include_archived:
+                    archived_task = db.get(TaskArchive, task_id)
+                    return (
+                        TaskSnapshot.from_task(archived_task, archived=True)
+                        if archived_task
+                        else None
+                    )
+                if task is not None and cache is not None:
+                    snapshot = TaskSnapshot.from_task(task)
+                    cache.set(task_id, snapshot)
+                    return snapshot
+                return task
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                print(f"Erro ao buscar tarefa: {e}")
+                return None
 
     def mark_task_as_completed(self, task_id: int) -> bool:
         """
-        Altera o status de uma tarefa para 'Concluída' no banco.
+        Altera o status de uma tarefa para 'Concluída' no banco, com um único
+        UPDATE ... RETURNING (sem buscar a tarefa antes).
         """
-        db = get_db_session()
-        try:
-            task = self._find_task_by_id(db, task_id)
-
-            if task:
-                task.status = "Concluída"
-                db.commit()
+        with self._session() as db:
+            try:
+                stmt = complete_task_statement(task_id)
+                updated_id = db.execute(stmt).scalar_one_or_none()
+                if updated_id is None:
+                    return False
+                self._commit(db, [updated_id])
                 return True
-            return False
-        except Exception as e:
-            db.rollback()
-            print(f"Erro ao marcar tarefa como concluída: {e}")
-            return False
-        finally:
-            db.close()
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                db.rollback()
+                print(f"Erro ao marcar tarefa como concluída: {e}")
+                return False
 
     def delete_task(self, task_id: int) -> bool:
         """
-        Remove uma tarefa do banco de dados.
+        Remove uma tarefa do banco de dados, com um único DELETE ... RETURNING
+        (sem buscar a tarefa antes).
         """
-        db = get_db_session()
-        try:
-            task = self._find_task_by_id(db, task_id)
-
-            if task:
-                db.delete(task)
-                db.commit()
+        with self._session() as db:
+            try:
+                stmt = delete_task_statement(task_id)
+                deleted_id = db.execute(stmt).scalar_one_or_none()
+                if deleted_id is None:
+                    return False
+                self._commit(db, [deleted_id])
                 return True
-            return False
-        except Exception as e:
-            db.rollback()
-            print(f"Erro ao deletar tarefa: {e}")
-            return False
-        finally:
-            db.close()
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                db.rollback()
+                print(f"Erro ao deletar tarefa: {e}")
+                return False
+
+    def add_tasks(
+        self, tasks: list[tuple[str, int, int]], chunk_size: int = BULK_CHUNK_SIZE
+    ) -> list[int]:
+        """
+        Cria várias tarefas de uma vez, com um único INSERT de múltiplas linhas
+        por bloco de `chunk_size` tarefas.
+
+        Args:
+            tasks (list[tuple[str, int, int]]): Tuplas (descrição, ID do usuário, ID da categoria).
+            chunk_size (int): Quantidade de tarefas por comando.
+
+        Returns:
+            list[int]: Os IDs das tarefas criadas (lista vazia se falhar).
+        """
+        with self._session() as db:
+            try:
+                created_ids = []
+                for chunk in iter_chunks(tasks, chunk_size):
+                    stmt = insert_tasks_statement(chunk)
+                    created_ids.extend(db.execute(stmt).scalars())
+                self._commit(db, created_ids)
+                return created_ids
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                db.rollback()
+                print(f"Erro ao adicionar tarefas: {e}")
+                return []
+
+    def complete_tasks(
+        self, task_ids: list[int], chunk_size: int = BULK_CHUNK_SIZE
+    ) -> list[int]:
+        """
+        Marca várias tarefas como 'Concluída' com um único UPDATE ... RETURNING
+        por bloco de `chunk_size` IDs.
+
+        Args:
+            task_ids (list[int]): Os IDs das tarefas.
+            chunk_size (int): Quantidade de IDs por comando.
+
+        Returns:
+            list[int]: Os IDs efetivamente atualizados (IDs inexistentes não aparecem).
+        """
+        with self._session() as db:
+            try:
+                completed_ids = []
+                for chunk in iter_chunks(task_ids, chunk_size):
+                    stmt = complete_tasks_statement(chunk)
+                    completed_ids.extend(db.execute(stmt).scalars())
+                self._commit(db, completed_ids)
+                return completed_ids
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                db.rollback()
+                print(f"Erro ao concluir tarefas: {e}")
+                return []
+
+    def delete_tasks(
+        self, task_ids: list[int], chunk_size: int = BULK_CHUNK_SIZE
+    ) -> list[int]:
+        """
+        Remove várias tarefas com um único DELETE ... RETURNING por bloco de
+        `chunk_size` IDs.
+
+        Args:
+            task_ids (list[int]): Os IDs das tarefas.
+            chunk_size (int): Quantidade de IDs por comando.
+
+        Returns:
+            list[int]: Os IDs efetivamente removidos (IDs inexistentes não aparecem).
+        """
+        with self._session() as db:
+            try:
+                deleted_ids = []
+                for chunk in iter_chunks(task_ids, chunk_size):
+                    deleted_ids.extend(delete_tasks_chunk(db, chunk))
+                self._commit(db, deleted_ids)
+                return deleted_ids
+            except Exception as e:
+                if self.session is not None:
+                    raise
+                db.rollback()
+                print(f"Erro ao deletar tarefas: {e}")
+                return []
@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+load_dotenv()
+
+_MISSING = object()
+# Chave, em `Session.info`, dos IDs a invalidar quando a sessão confirmar.
+_PENDING_INVALIDATIONS = "invalidate_task_ids"
+
+
+class LRUCache:
+    """
+    Cache em memória (por processo) com descarte LRU e expiração por TTL.
+
+    É seguro para uso entre threads e mantém contadores de acertos (hits),
+    faltas (misses) e descartes (evictions, por capacidade ou por expiração).
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """
+        Args:
+            max_size (int): Quantidade máxima de entradas.
+            ttl_seconds (float): Tempo de vida de cada entrada, em segundos.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Retorna o valor da chave (marcando-a como usada recentemente), ou
+        `default` se ela não existir ou tiver expirado.
+        """
+        with self._lock:
+            value, expires_at = self._entries.get(key, (_MISSING, 0.0))
+            if value is not _MISSING and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                value = _MISSING
+
+            if value is _MISSING:
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Guarda o valor, descartando a entrada menos usada se o cache encher."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys):
+        """Remove as chaves informadas (chaves ausentes são ignoradas)."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove todas as entradas (os contadores são mantidos)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Contadores `hits`, `misses`, `evictions` e o tamanho atual.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+
+_task_cache = None
+_task_cache_lock = threading.Lock()
+
+
+def get_task_cache() -> LRUCache | None:
+    """
+    Retorna o cache de tarefas do processo, criado na primeira chamada a
+    partir de TASK_CACHE_SIZE e TASK_CACHE_TTL_SECONDS.
+
+    Returns:
+        LRUCache or None: O cache, ou None se TASK_CACHE_SIZE for 0 (desativado).
+    """
+    global _task_cache
+    if _task_cache is None:
+        with _task_cache_lock:
+            max_size = int(os.getenv("TASK_CACHE_SIZE", "0"))
+            if _task_cache is None and max_size > 0:
+                ttl_seconds = float(os.getenv("TASK_CACHE_TTL_SECONDS", "30"))
+                _task_cache = LRUCache(max_size, ttl_seconds)
+    return _task_cache
+
+
+def invalidate_tasks(task_ids):
+    """Remove do cache de tarefas (se ativo) as tarefas com os IDs informados."""
+    cache = get_task_cache()
+    if cache is not None:
+        cache.invalidate(*task_ids)
+
+
+def invalidate_tasks_on_commit(session, task_ids):
+    """
+    Agenda a remoção das tarefas do cache para logo após o commit da sessão.
+    Invalidar antes do commit não basta: uma leitura feita entre o flush e o
+    commit guardaria de novo a versão antiga, que ficaria no cache até o TTL.
+    Em caso de rollback da transação externa, a remoção é descartada.
+
+    Args:
+        session: Session (ou AsyncSession) que fará o commit.
+        task_ids: IDs das tarefas alteradas.
+    """
+    session = getattr(session, "sync_session", session)
+    session.info.setdefault(_PENDING_INVALIDATIONS, set()).update(task_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tasks(session):
+    """Aplica as invalidações agendadas na sessão que acabou de confirmar."""
+    task_ids = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if task_ids:
+        invalidate_tasks(task_ids)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_invalidations(session, previous_transaction):
+    """Descarta as invalidações agendadas quando a transação externa é desfeita."""
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_INVALIDATIONS, None)
@@ -1,9 +1,11 @@
 import os
+from contextlib import asynccontextmanager, contextmanager
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 from src.model import Base 
 from sqlalchemy.exc import OperationalError 
+from src.utils.migrations import migrate
 
 load_dotenv()
 DB_USER = os.getenv("DB_USER", "postgres")
@@ -14,20 +16,128 @@ DB_NAME = os.getenv("DB_NAME", "db_taskfy_tp3")
 
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_engine(DATABASE_URL, echo=False)
+# Configuração do pool de conexões (valores padrão iguais aos do SQLAlchemy).
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args=(
+        {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+        if DB_STATEMENT_TIMEOUT_MS
+        else {}
+    ),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrono (asyncpg), criado apenas no primeiro uso para que os
+# scripts síncronos não dependam do driver assíncrono.
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+_async_engine = None
+_AsyncSessionLocal = None
+
 def get_db_session():
     """Retorna uma nova instância de sessão do banco de dados."""
     return SessionLocal()
 
+@contextmanager
+def session_scope():
+    """
+    Unidade de trabalho: fornece uma sessão com uma única transação.
+    Faz commit ao final do bloco `with`, rollback se ocorrer uma exceção e
+    sempre devolve a conexão ao pool.
+
+    Exemplo:
+        with session_scope() as db:
+            service = TaskService(db)
+            task = service.add_task("Nova tarefa", 1, 1)
+            service.mark_task_as_completed(task.id_task)
+    """
+    db = get_db_session()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def get_async_engine():
+    """
+    Retorna o engine assíncrono (asyncpg), criado na primeira chamada com a
+    mesma configuração de pool do engine síncrono.
+    """
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            echo=False,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+            connect_args=(
+                {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+                if DB_STATEMENT_TIMEOUT_MS
+                else {}
+            ),
+        )
+    return _async_engine
+
+def get_async_db_session():
+    """Retorna uma nova instância de sessão assíncrona (AsyncSession)."""
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _AsyncSessionLocal()
+
+@asynccontextmanager
+async def async_session_scope():
+    """
+    Versão assíncrona de `session_scope`: commit ao final do bloco
+    `async with`, rollback se ocorrer uma exceção.
+
+    Exemplo:
+        async with async_session_scope() as db:
+            service = AsyncTaskService(db)
+            task = await service.add_task("Nova tarefa", 1, 1)
+    """
+    db = get_async_db_session()
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
 def init_db():
     """
-    Cria todas as tabelas (definidas nos modelos) no banco de dados.
+    Atualiza o esquema do banco aplicando as migrações versionadas pendentes
+    de `sql/migrations` (registradas em `schema_migrations`).
     Esta função é segura para ser chamada múltiplas vezes.
     """
     try:
-        Base.metadata.create_all(bind=engine)
+        migrate(engine)
     except Exception as e:
         print(f"Erro ao inicializar o banco: {e}")
 
@@ -0,0 +1,130 @@
+import json
+
+READ_SIZE = 64 * 1024
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+
+
+def iter_json_records(file_path: str, read_size: int = READ_SIZE):
+    """
+    Lê registros de um arquivo JSON de forma incremental (streaming).
+
+    Aceita tanto um array JSON (`[{...}, {...}]`) quanto JSON delimitado por
+    linhas (JSONL, um objeto por linha). Apenas um bloco de leitura e o
+    registro atual ficam em memória, independentemente do tamanho do arquivo.
+
+    Args:
+        file_path (str): Caminho do arquivo a ser lido.
+        read_size (int): Quantidade de caracteres lidos por vez.
+
+    Yields:
+        dict: O próximo registro do arquivo.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir.
+        json.JSONDecodeError: Se o conteúdo não for JSON válido.
+    """
+    # "utf-8-sig" descarta o BOM inicial, inclusive após o seek(0) do JSONL.
+    with open(file_path, "r", encoding="utf-8-sig") as f:
+        # O formato é decidido pelo primeiro caractere útil, que pode estar
+        # depois de vários blocos só com espaços em branco.
+        buffer = ""
+        while not buffer:
+            chunk = f.read(read_size)
+            if not chunk:
+                return
+            buffer = chunk.lstrip()
+
+        if buffer.startswith("["):
+            yield from _iter_json_array(f, buffer, read_size)
+        else:
+            f.seek(0)
+            yield from _iter_json_lines(f)
+
+
+def _iter_json_lines(file):
+    """
+    Decodifica um arquivo JSONL, ignorando linhas em branco.
+    (Função auxiliar interna)
+    """
+    for line in file:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _iter_json_array(file, buffer: str, read_size: int):
+    """
+    Decodifica os elementos de um array JSON conforme o arquivo é lido,
+    usando `JSONDecoder.raw_decode` sobre um buffer deslizante. Vírgulas
+    ausentes ou sobrando entre os elementos e qualquer conteúdo além de
+    espaços após o `]` final geram `json.JSONDecodeError`.
+    (Função auxiliar interna)
+    """
+    decoder = json.JSONDecoder()
+    position = buffer.index("[") + 1
+    eof = False
+    # first: logo após "[" (aceita "]"); value: após ","; separator: após um valor.
+    state = "first"
+
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+
+        if position < len(buffer):
+            char = buffer[position]
+            if state == "separator":
+                if char == ",":
+                    position += 1
+                    state = "value"
+                    continue
+                if char == "]":
+                    position += 1
+                    break
+                raise json.JSONDecodeError(
+                    "Esperado ',' ou ']' entre os elementos do array", buffer, position
+                )
+
+            if char == ",":
+                raise json.JSONDecodeError("Vírgula sem elemento", buffer, position)
+            if char == "]":
+                if state == "first":
+                    position += 1
+                    break
+                raise json.JSONDecodeError(
+                    "Vírgula sobrando antes de ']'", buffer, position
+                )
+
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof or len(buffer) - position > MAX_RECORD_SIZE:
+                    raise
+            else:
+                # Um valor que termina no fim do buffer (ex.: um número) pode
+                # continuar no próximo bloco.
+                if end < len(buffer) or eof:
+                    yield record
+                    position = end
+                    state = "separator"
+                    continue
+
+        if eof:
+            raise json.JSONDecodeError("Array JSON não finalizado", buffer, position)
+
+        # Descarta o que já foi consumido e lê o próximo bloco.
+        more = file.read(read_size)
+        eof = not more
+        buffer = buffer[position:] + more
+        position = 0
+
+    # Após o "]" final, só são permitidos espaços em branco.
+    rest = buffer[position:]
+    while True:
+        if rest.strip():
+            offset = len(rest) - len(rest.lstrip())
+            raise json.JSONDecodeError(
+                "Conteúdo extra após o fim do array JSON", rest, offset
+            )
+        rest = file.read(read_size)
+        if not rest:
+            return
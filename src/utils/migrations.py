@@ -0,0 +1,193 @@
+import hashlib
+import re
+from pathlib import Path
+from typing import NamedTuple
+from sqlalchemy import text
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "sql" / "migrations"
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+MIGRATIONS_TABLE = "schema_migrations"
+# Chave do advisory lock que serializa execuções simultâneas do migrador.
+MIGRATIONS_LOCK_KEY = 7_120_016
+
+_FILE_PATTERN = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+
+class Migration(NamedTuple):
+    """
+    Uma migração versionada lida de `sql/migrations/NNNN_nome.sql`.
+
+    Attributes:
+        version (int): O número da versão (prefixo do arquivo).
+        name (str): O nome descritivo da migração.
+        sql (str): O conteúdo SQL do arquivo.
+        checksum (str): SHA-256 do conteúdo, para detectar arquivos alterados.
+        transactional (bool): False se o arquivo tiver o marcador
+            `-- migrate: no-transaction` (ex: CREATE INDEX CONCURRENTLY).
+    """
+
+    version: int
+    name: str
+    sql: str
+    checksum: str
+    transactional: bool
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> list[Migration]:
+    """
+    Lê as migrações do diretório, ordenadas por versão.
+
+    Raises:
+        ValueError: Se duas migrações tiverem a mesma versão.
+    """
+    migrations = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Versão de migração duplicada: {path.name}")
+        sql = path.read_text(encoding="utf-8")
+        migrations[version] = Migration(
+            version=version,
+            name=match.group(2),
+            sql=sql,
+            checksum=hashlib.sha256(sql.encode("utf-8")).hexdigest(),
+            transactional=NO_TRANSACTION_MARKER not in sql,
+        )
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def split_statements(sql: str) -> list[str]:
+    """
+    Separa um arquivo SQL em comandos, removendo as linhas de comentário.
+    Usado nas migrações sem transação, em que cada comando precisa ser enviado
+    sozinho (os arquivos não devem ter ';' dentro de literais ou funções).
+    """
+    lines = [line for line in sql.splitlines() if not line.lstrip().startswith("--")]
+    statements = "\n".join(lines).split(";")
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+def _ensure_migrations_table(connection):
+    """Cria a tabela de controle das migrações, se não existir."""
+    connection.execute(
+        text(
+            f"""
+            CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(200) NOT NULL,
+                checksum VARCHAR(64) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+    )
+
+
+def applied_migrations(connection) -> dict:
+    """
+    Returns:
+        dict: {versão: (checksum, applied_at)} das migrações já aplicadas.
+    """
+    _ensure_migrations_table(connection)
+    rows = connection.execute(
+        text(f"SELECT version, checksum, applied_at FROM {MIGRATIONS_TABLE}")
+    )
+    return {version: (checksum, applied_at) for version, checksum, applied_at in rows}
+
+
+def _record_migration(connection, migration: Migration):
+    """Registra a migração como aplicada."""
+    connection.execute(
+        text(
+            f"INSERT INTO {MIGRATIONS_TABLE} (version, name, checksum) "
+            "VALUES (:version, :name, :checksum)"
+        ),
+        {
+            "version": migration.version,
+            "name": migration.name,
+            "checksum": migration.checksum,
+        },
+    )
+
+
+def _apply_migration(engine, migration: Migration):
+    """
+    Aplica uma migração. As transacionais rodam inteiras em uma transação
+    junto com o seu registro; as demais rodam em autocommit, um comando por
+    vez, e só são registradas se todos os comandos tiverem sucesso.
+    (Função auxiliar interna)
+    """
+    if migration.transactional:
+        with engine.begin() as connection:
+            # Cursor do driver: o arquivo tem vários comandos e pode conter '%'.
+            connection.connection.cursor().execute(migration.sql)
+            _record_migration(connection, migration)
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        cursor = connection.connection.cursor()
+        for statement in split_statements(migration.sql):
+            cursor.execute(statement)
+        _record_migration(connection, migration)
+
+
+def migrate(engine, target: int | None = None, directory: Path = MIGRATIONS_DIR):
+    """
+    Aplica, em ordem, as migrações ainda não registradas em
+    `schema_migrations` (até a versão `target`, se informada). Um advisory
+    lock impede que duas instâncias migrem o mesmo banco ao mesmo tempo.
+
+    Args:
+        engine: Engine do SQLAlchemy.
+        target (int): Última versão a aplicar (opcional).
+        directory (Path): Diretório dos arquivos de migração.
+
+    Returns:
+        list[Migration]: As migrações aplicadas nesta execução.
+    """
+    migrations = load_migrations(directory)
+    applied_now = []
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock:
+        lock.execute(
+            text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATIONS_LOCK_KEY}
+        )
+        try:
+            applied = applied_migrations(lock)
+            for migration in migrations:
+                if target is not None and migration.version > target:
+                    break
+                if migration.version in applied:
+                    if applied[migration.version][0] != migration.checksum:
+                        print(
+                            f"Atenção: a migração {migration.version:04d}_{migration.name} "
+                            "foi alterada depois de aplicada."
+                        )
+                    continue
+
+                print(f"Aplicando migração {migration.version:04d}_{migration.name}...")
+                _apply_migration(engine, migration)
+                applied_now.append(migration)
+        finally:
+            lock.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATIONS_LOCK_KEY}
+            )
+
+    return applied_now
+
+
+def migration_status(engine, directory: Path = MIGRATIONS_DIR) -> list[tuple]:
+    """
+    Returns:
+        list[tuple]: (Migration, applied_at ou None) para cada migração conhecida.
+    """
+    with engine.connect() as connection:
+        applied = applied_migrations(connection)
+        connection.commit()
+    return [
+        (migration, applied.get(migration.version, (None, None))[1])
+        for migration in load_migrations(directory)
+    ]
@@ -0,0 +1,50 @@
+class ReportResult:
+    """
+    Resultado de relatório já materializado, guardado por coluna.
+
+    É lido uma única vez do banco (a sessão pode ser fechada logo em seguida)
+    e pode ser consumido quantas vezes for preciso, como dicionários, tuplas
+    ou colunas, sem executar a consulta novamente.
+
+    Attributes:
+        columns (tuple[str]): Os nomes das colunas, na ordem da consulta.
+        data (dict[str, list]): Os valores de cada coluna.
+        as_of (datetime): Momento a que os dados se referem, quando vêm de uma
+            materialized view (None para dados lidos na hora).
+    """
+
+    __slots__ = ("columns", "data", "as_of", "_length")
+
+    def __init__(self, columns, data: dict, as_of=None):
+        self.columns = tuple(columns)
+        self.data = data
+        self.as_of = as_of
+        self._length = len(data[self.columns[0]]) if self.columns else 0
+
+    @classmethod
+    def from_result(cls, result, as_of=None) -> "ReportResult":
+        """
+        Lê todas as linhas de um `Result` do SQLAlchemy e as transpõe para colunas.
+        """
+        columns = tuple(result.keys())
+        rows = result.all()
+        if rows:
+            data = {name: list(values) for name, values in zip(columns, zip(*rows))}
+        else:
+            data = {name: [] for name in columns}
+        return cls(columns, data, as_of)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def column(self, name: str) -> list:
+        """Retorna todos os valores de uma coluna."""
+        return self.data[name]
+
+    def all(self) -> list[tuple]:
+        """Retorna as linhas como tuplas (renderização em LISTA)."""
+        return list(zip(*(self.data[name] for name in self.columns)))
+
+    def mappings(self) -> list[dict]:
+        """Retorna as linhas como dicionários coluna -> valor (renderização em DICIONÁRIO)."""
+        return [dict(zip(self.columns, row)) for row in self.all()]